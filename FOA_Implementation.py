@@ -1,297 +1,216 @@
 """
 FOA_Implementation.py
+
+Tk frontend: the board view and the app window. The solvers, generator and
+caches live in the sudoku_core package, which has no GUI dependency.
 """
 
 import tkinter as tk
 from tkinter import messagebox, filedialog, simpledialog, ttk
-import copy, time, random, threading
-
-# -----------------------------
-# Sudoku data model
-# -----------------------------
-class SudokuBoard:
-    def __init__(self, grid=None):
-        self.grid = [row[:] for row in grid] if grid else [[0]*9 for _ in range(9)]
-
-    @staticmethod
-    def from_string(s):
-        s = ''.join(ch for ch in s if ch.isdigit() or ch in '.0')
-        if len(s) < 81:
-            raise ValueError("Puzzle must contain at least 81 characters (digits/0/.)")
-        grid = [[0]*9 for _ in range(9)]
-        for i,ch in enumerate(s[:81]):
-            r,c = divmod(i,9)
-            grid[r][c] = 0 if ch in '.0' else int(ch)
-        return SudokuBoard(grid)
-
-    def copy(self):
-        return SudokuBoard(self.grid)
-
-    def find_empty(self):
-        for r in range(9):
-            for c in range(9):
-                if self.grid[r][c] == 0:
-                    return (r,c)
-        return None
-
-    def is_valid_move(self, r, c, val):
-        if val == 0: return True
-        for j in range(9):
-            if j != c and self.grid[r][j] == val:
-                return False
-        for i in range(9):
-            if i != r and self.grid[i][c] == val:
-                return False
-        br,bc = (r//3)*3, (c//3)*3
-        for i in range(br,br+3):
-            for j in range(bc,bc+3):
-                if (i,j) != (r,c) and self.grid[i][j] == val:
-                    return False
-        return True
-
-    def is_consistent(self):
-        # quick check: no duplicates among filled cells
-        for r in range(9):
-            seen=set()
-            for c in range(9):
-                v=self.grid[r][c]
-                if v!=0:
-                    if v in seen: return False
-                    seen.add(v)
-        for c in range(9):
-            seen=set()
-            for r in range(9):
-                v=self.grid[r][c]
-                if v!=0:
-                    if v in seen: return False
-                    seen.add(v)
-        for br in (0,3,6):
-            for bc in (0,3,6):
-                seen=set()
-                for i in range(br,br+3):
-                    for j in range(bc,bc+3):
-                        v=self.grid[i][j]
-                        if v!=0:
-                            if v in seen: return False
-                            seen.add(v)
-        return True
+import os, time, threading
+from collections import deque
 
-# -----------------------------
-# Backtracking solver
-# -----------------------------
-class BacktrackingSolver:
-    def __init__(self):
-        self.nodes = 0
-        self.backtracks = 0
-
-    def solve(self, board: SudokuBoard, limit_nodes=None):
-        self.nodes = 0
-        self.backtracks = 0
-        start = time.time()
-        ok = self._dfs(board, limit_nodes)
-        elapsed = time.time() - start
-        return ok, elapsed, self.nodes, self.backtracks
-
-    def _dfs(self, board, limit):
-        self.nodes += 1
-        if limit and self.nodes > limit:
-            return False
-        empty = board.find_empty()
-        if not empty:
-            return True
-        r,c = empty
-        for v in range(1,10):
-            if board.is_valid_move(r,c,v):
-                board.grid[r][c] = v
-                if self._dfs(board, limit): return True
-                board.grid[r][c] = 0
-                self.backtracks += 1
-        return False
-
-    def count_solutions(self, board: SudokuBoard, limit=2):
-        self._count = 0
-        def dfs(b):
-            if self._count >= limit: return
-            e = b.find_empty()
-            if not e:
-                self._count += 1; return
-            r,c = e
-            for v in range(1,10):
-                if b.is_valid_move(r,c,v):
-                    b.grid[r][c]=v
-                    dfs(b)
-                    b.grid[r][c]=0
-                    if self._count >= limit: return
-        dfs(board)
-        return self._count
-
-# -----------------------------
-# CSP solver (AC-3 + MRV + LCV)
-# -----------------------------
-class CSPSolver:
-    def __init__(self):
-        self.nodes = 0
-        self.backtracks = 0
-
-    def solve(self, board: SudokuBoard):
-        domains = {(r,c): set(range(1,10)) if board.grid[r][c]==0 else {board.grid[r][c]}
-                   for r in range(9) for c in range(9)}
-        if not self.ac3(domains):
-            return None, 0, 0, 0
-        self.nodes = 0; self.backtracks = 0
-        start = time.time()
-        res = self._backtrack(domains)
-        elapsed = time.time() - start
-        if res:
-            out = SudokuBoard([[0]*9 for _ in range(9)])
-            for (r,c),val in res.items(): out.grid[r][c] = val
-            return out, elapsed, self.nodes, self.backtracks
-        return None, elapsed, self.nodes, self.backtracks
-
-    def neighbors(self, var):
-        r,c = var
-        neigh=[]
-        for i in range(9):
-            if i!=c: neigh.append((r,i))
-            if i!=r: neigh.append((i,c))
-        br,bc=(r//3)*3,(c//3)*3
-        for i in range(br,br+3):
-            for j in range(bc,bc+3):
-                if (i,j)!=var and (i,j) not in neigh: neigh.append((i,j))
-        return neigh
-
-    def ac3(self, domains):
-        from collections import deque
-        q = deque()
-        for xi in domains:
-            for xj in self.neighbors(xi): q.append((xi,xj))
-        while q:
-            xi,xj = q.popleft()
-            if self.revise(domains, xi, xj):
-                if not domains[xi]: return False
-                for xk in self.neighbors(xi):
-                    if xk!=xj: q.append((xk, xi))
-        return True
-
-    def revise(self, domains, xi, xj):
-        removed=False; rem=set()
-        for a in set(domains[xi]):
-            if not any(self.vals_consistent(xi,a,xj,b) for b in domains[xj]):
-                rem.add(a)
-        if rem:
-            domains[xi] -= rem; removed=True
-        return removed
-
-    def vals_consistent(self, xi,a,xj,b):
-        (r1,c1),(r2,c2)=xi,xj
-        if r1==r2 or c1==c2 or (r1//3==r2//3 and c1//3==c2//3): return a!=b
-        return True
-
-    def select_unassigned(self, domains):
-        un=[v for v in domains if len(domains[v])>1]
-        if not un: return None
-        mrv = min(len(domains[v]) for v in un)
-        cands=[v for v in un if len(domains[v])==mrv]
-        if len(cands)==1: return cands[0]
-        best,bd=None,-1
-        for v in cands:
-            deg = sum(1 for n in self.neighbors(v) if len(domains[n])>1)
-            if deg>bd:
-                bd=deg; best=v
-        return best
-
-    def order_values(self,var,domains):
-        costs=[]
-        for val in domains[var]:
-            cost = sum(1 for n in self.neighbors(var) if val in domains[n])
-            costs.append((cost,val))
-        costs.sort()
-        return [v for _,v in costs]
-
-    def consistent_with_neighbors(self,var,val,domains):
-        for n in self.neighbors(var):
-            if len(domains[n])==1 and next(iter(domains[n]))==val: return False
-        return True
-
-    def _backtrack(self, domains):
-        self.nodes += 1
-        if all(len(domains[v])==1 for v in domains): return {v: next(iter(domains[v])) for v in domains}
-        var = self.select_unassigned(domains)
-        if var is None: return None
-        for val in self.order_values(var, domains):
-            if self.consistent_with_neighbors(var,val,domains):
-                new = copy.deepcopy(domains); new[var] = {val}
-                if self.ac3(new):
-                    res = self._backtrack(new)
-                    if res: return res
-                self.backtracks += 1
-        return None
+from sudoku_core import (SudokuBoard, RunContext, SolverCancelled, SolverTimeout, BacktrackingSolver, CSPSolver,
+                         DLXSolver, LogicSolver, Generator, SolutionCache, PuzzlePool, ParallelSearch, EditorModel)
 
 # -----------------------------
-# Puzzle generator
+# Canvas grid renderer
 # -----------------------------
-class Generator:
-    def __init__(self):
-        self.bt = BacktrackingSolver()
-
-    def generate_full(self):
-        board = SudokuBoard([[0]*9 for _ in range(9)])
-        nums = list(range(1,10))
-        def fill(idx=0):
-            if idx==81: return True
-            r,c = divmod(idx,9)
-            if board.grid[r][c]!=0: return fill(idx+1)
-            random.shuffle(nums)
-            for v in nums:
-                if board.is_valid_move(r,c,v):
-                    board.grid[r][c]=v
-                    if fill(idx+1): return True
-                    board.grid[r][c]=0
-            return False
-        for k in (0,3,6):
-            vals=list(range(1,10)); random.shuffle(vals); idx=0
-            for i in range(k,k+3):
-                for j in range(k,k+3):
-                    board.grid[i][j]=vals[idx]; idx+=1
-        fill(0)
-        return board
-
-    def make_puzzle(self, difficulty='Medium'):
-        targets={'Easy':36,'Medium':46,'Hard':54}
-        target = targets.get(difficulty,46)
-        full = self.generate_full()
-        positions=[(r,c) for r in range(9) for c in range(9)]
-        random.shuffle(positions)
-        puzzle = full.copy()
-        removed=0
-        for (r,c) in positions:
-            if removed >= target: break
-            backup = puzzle.grid[r][c]; puzzle.grid[r][c]=0
-            temp = puzzle.copy()
-            count = self.bt.count_solutions(temp, limit=2)
-            if count != 1:
-                puzzle.grid[r][c]=backup
-            else:
-                removed += 1
-        return puzzle
+class GridView:
+    # The board drawn on one Canvas. Cell rectangles and texts are created once and only
+    # reconfigured. Setters change the model and mark the cell dirty; a single flush, run when
+    # Tk is next idle, pushes each dirty cell's look to the canvas and skips cells whose look
+    # did not change. So a whole-board update costs one redraw, not 81 widget configs.
+    # Must only be used from the Tk thread.
+    # Empty cells can show pencil marks: set_marks() takes a candidate bit mask per cell and
+    # they are drawn as one small text item per cell while show_marks is on.
+    CELL = 46; PAD = 4
+    GIVEN_BG = "#F2F2F2"; EMPTY_BG = "white"; SELECT = "#3A7BD5"; MARKS_FG = "#808080"
+
+    def __init__(self, master, n=9, box=3, on_edit=None):
+        self.n, self.box = n, box
+        self.on_edit = on_edit                    # on_edit(r, c) after the user changes a cell
+        self.values = [[0]*n for _ in range(n)]
+        self.given = [[False]*n for _ in range(n)]
+        self.bg = [[None]*n for _ in range(n)]    # highlight colour, None for the default
+        self.marks = [[0]*n for _ in range(n)]    # candidate masks for the pencil marks
+        self.show_marks = False
+        self.selected = None
+        self._dirty = set(); self._flush_job = None
+        self._shown = {}                          # (r,c) -> (text, fill, font, marks) last pushed to Tk
+        self._marks_text = {}                     # mask -> pencil-mark string
+        size = n*self.CELL + 2*self.PAD
+        cv = self.canvas = tk.Canvas(master, width=size, height=size, bg="white", highlightthickness=0)
+        self._font = ("Helvetica", 16); self._given_font = ("Helvetica", 16, "bold")
+        marks_font = ("Courier", 7)
+        self.rects = [[None]*n for _ in range(n)]; self.texts = [[None]*n for _ in range(n)]
+        self.mark_texts = [[None]*n for _ in range(n)]
+        for r in range(n):
+            for c in range(n):
+                x0, y0, x1, y1 = self._bbox(r, c)
+                self.rects[r][c] = cv.create_rectangle(x0, y0, x1, y1, fill=self.EMPTY_BG, outline="")
+                self.texts[r][c] = cv.create_text((x0+x1)//2, (y0+y1)//2, text="", font=self._font)
+                self.mark_texts[r][c] = cv.create_text((x0+x1)//2, (y0+y1)//2, text="", font=marks_font,
+                                                       fill=self.MARKS_FG, justify="center")
+        for k in range(n+1):
+            p = self.PAD + k*self.CELL
+            w, colour = (3, "black") if k % box == 0 else (1, "#A0A0A0")
+            cv.create_line(self.PAD, p, size-self.PAD, p, width=w, fill=colour)
+            cv.create_line(p, self.PAD, p, size-self.PAD, width=w, fill=colour)
+        self.cursor = cv.create_rectangle(0, 0, 0, 0, outline=self.SELECT, width=3, state="hidden")
+        cv.bind("<Button-1>", self._click)
+        cv.bind("<Key>", self._key)
+
+    def _bbox(self, r, c):
+        x0 = self.PAD + c*self.CELL; y0 = self.PAD + r*self.CELL
+        return x0, y0, x0 + self.CELL, y0 + self.CELL
+
+    # ---------- model ----------
+    def value(self, r, c):
+        return self.values[r][c]
+
+    def set_value(self, r, c, v):
+        if self.values[r][c] != v: self.values[r][c] = v; self._mark(r, c)
+
+    def set_given(self, r, c, given):
+        if self.given[r][c] != given: self.given[r][c] = given; self._mark(r, c)
+
+    def set_bg(self, r, c, colour=None):
+        if self.bg[r][c] != colour: self.bg[r][c] = colour; self._mark(r, c)
+
+    def set_marks(self, r, c, mask):
+        if self.marks[r][c] != mask: self.marks[r][c] = mask; self._mark(r, c)
+
+    def set_show_marks(self, show):
+        self.show_marks = show
+        for r in range(self.n):
+            for c in range(self.n): self._mark(r, c)
+
+    def _marks_for(self, mask):
+        text = self._marks_text.get(mask)
+        if text is None:
+            b = self.box
+            text = self._marks_text[mask] = "\n".join(
+                " ".join(str(d) if mask >> (d-1) & 1 else " " for d in range(k*b+1, k*b+b+1)) for k in range(b))
+        return text
+
+    def clear_bgs(self):
+        for r in range(self.n):
+            for c in range(self.n): self.set_bg(r, c, None)
+
+    def select(self, r, c):
+        self.selected = (r, c)
+        x0, y0, x1, y1 = self._bbox(r, c)
+        self.canvas.coords(self.cursor, x0+2, y0+2, x1-2, y1-2)
+        self.canvas.itemconfigure(self.cursor, state="normal")
+
+    # ---------- drawing ----------
+    def _mark(self, r, c):
+        self._dirty.add((r, c))
+        if self._flush_job is None: self._flush_job = self.canvas.after_idle(self.flush)
+
+    def flush(self):
+        self._flush_job = None
+        cv = self.canvas
+        for r, c in self._dirty:
+            v = self.values[r][c]; given = self.given[r][c]
+            look = (str(v) if v else "", self.bg[r][c] or (self.GIVEN_BG if given else self.EMPTY_BG),
+                    self._given_font if given else self._font,
+                    self._marks_for(self.marks[r][c]) if self.show_marks and not v else "")
+            old = self._shown.get((r, c))
+            if look == old: continue
+            if old is None or look[0] != old[0] or look[2] != old[2]:
+                cv.itemconfigure(self.texts[r][c], text=look[0], font=look[2])
+            if old is None or look[1] != old[1]:
+                cv.itemconfigure(self.rects[r][c], fill=look[1])
+            if old is None or look[3] != old[3]:
+                cv.itemconfigure(self.mark_texts[r][c], text=look[3])
+            self._shown[(r, c)] = look
+        self._dirty.clear()
+
+    # ---------- input ----------
+    def _click(self, ev):
+        c = (ev.x - self.PAD) // self.CELL; r = (ev.y - self.PAD) // self.CELL
+        if 0 <= r < self.n and 0 <= c < self.n:
+            self.select(r, c)
+        self.canvas.focus_set()
+
+    def _key(self, ev):
+        if self.selected is None: return
+        r, c = self.selected
+        moves = {"Left": (0, -1), "Right": (0, 1), "Up": (-1, 0), "Down": (1, 0)}
+        if ev.keysym in moves:
+            dr, dc = moves[ev.keysym]
+            self.select((r + dr) % self.n, (c + dc) % self.n)
+            return
+        if self.given[r][c]: return
+        if ev.char and ev.char in "123456789"[:self.n]: v = int(ev.char)
+        elif ev.keysym in ("BackSpace", "Delete", "0", "space"): v = 0
+        else: return
+        if v != self.values[r][c]:
+            self.set_value(r, c, v)
+            if self.on_edit: self.on_edit(r, c)
+
+class FrameScheduler:
+    # Plays a list of UI steps on the Tk loop, one every `interval_ms`, checking once per
+    # frame. All steps that came due by a frame run together and the GridView flushes once
+    # after them, so a slow display drops frames instead of falling behind a redraw per step.
+    def __init__(self, root, frame_ms=16):
+        self.root = root
+        self.frame_ms = frame_ms
+        self._steps = deque(); self._job = None; self._on_done = None
+
+    def play(self, steps, interval_ms, on_done=None):
+        self.cancel()
+        self._steps = deque(steps); self._on_done = on_done
+        self._interval = interval_ms / 1000.0; self._ran = 0
+        self._start = time.perf_counter()
+        self._job = self.root.after(0, self._tick)
+
+    def running(self):
+        return self._job is not None
+
+    def cancel(self):
+        if self._job is not None: self.root.after_cancel(self._job)
+        self._job = None
+        self._steps.clear()
+
+    def _tick(self):
+        elapsed = time.perf_counter() - self._start
+        due = int(elapsed / self._interval) + 1 if self._interval else self._ran + len(self._steps)
+        while self._steps and self._ran < due:
+            self._steps.popleft()(); self._ran += 1
+        if self._steps:
+            self._job = self.root.after(self.frame_ms, self._tick)
+        else:
+            self._job = None
+            if self._on_done: self._on_done()
 
 # -----------------------------
 # Main UI
 # -----------------------------
 class SudokuApp:
+    CONFLICT_BG = "#FFB8B8"; HINT_BG = "#DFF7DF"
+
     def __init__(self, root):
         self.root = root
         root.title("Sudoku Solver")
         root.resizable(False, False)
-        self.bt_solver = BacktrackingSolver()
-        self.csp_solver = CSPSolver()
+        self.dlx_solver = DLXSolver()
+        self.solution_cache = SolutionCache()
+        self.logic = LogicSolver()
         self.generator = Generator()
+        self.counter = ParallelSearch()      # worker processes start on first use
+        self.pool = PuzzlePool(os.path.join(os.path.dirname(os.path.abspath(__file__)), "puzzle_pool.txt"))
         self.history=[]
-        self.given = [[False]*9 for _ in range(9)]
-        self.conflicts = set()
+        self.model = EditorModel()           # the board as edited: live conflicts and candidates
         self.animate_speed = 60
+        self.run_ctx = None
         self._build_menu()
         self._build_ui()
+        self.scheduler = FrameScheduler(root)
+        root.protocol("WM_DELETE_WINDOW", self.exit_app)
+        self.pool.refill()
         self._startup_preference()
 
     def _build_menu(self):
@@ -309,21 +228,9 @@ class SudokuApp:
         main = tk.Frame(self.root, padx=12, pady=6)
         main.pack()
 
-        grid_frame = tk.Frame(main)
-        grid_frame.grid(row=0, column=0, padx=(0,12))
-
-        self.vars = [[tk.StringVar() for _ in range(9)] for _ in range(9)]
-        self.entries = [[None]*9 for _ in range(9)]
-        font = ("Helvetica", 16)
-
-        for r in range(9):
-            for c in range(9):
-                vcmd = (self.root.register(self._validate_cell), '%P')
-                e = tk.Entry(grid_frame, width=3, font=font, justify='center', textvariable=self.vars[r][c],
-                             bg="white", fg="black", bd=2, relief='ridge', validate='key', validatecommand=vcmd)
-                e.grid(row=r, column=c, padx=(2 if c%3 else 6), pady=(2 if r%3 else 6))
-                e.bind("<KeyRelease>", lambda ev, rr=r, cc=c: self._on_edit(ev, rr, cc))
-                self.entries[r][c] = e
+        # click a cell to select it, type 1-9 to fill, Backspace/0 to clear, arrows to move
+        self.view = GridView(main, on_edit=self._on_edit)
+        self.view.canvas.grid(row=0, column=0, padx=(0,12), sticky="n")
 
         controls = tk.Frame(main)
         controls.grid(row=0, column=1, sticky="n")
@@ -343,16 +250,22 @@ class SudokuApp:
         tk.Label(controls, text="Solving options", font=("Helvetica",11,"bold")).pack(anchor="w", pady=(8,4))
         tk.Button(controls, text="Solve (Backtracking)", width=20, command=self.solve_backtracking).pack(pady=3)
         tk.Button(controls, text="Solve (CSP)", width=20, command=self.solve_csp).pack(pady=3)
-        tk.Button(controls, text="Animated Solve (CSP)", width=20, command=lambda: threading.Thread(target=self.animated_solve, args=("csp",)).start()).pack(pady=3)
-        tk.Button(controls, text="Hint (CSP): reveal one safe cell", width=24, command=self.hint_one).pack(pady=(6,2))
+        tk.Button(controls, text="Solve (DLX)", width=20, command=self.solve_dlx).pack(pady=3)
+        tk.Button(controls, text="Animated Solve (CSP)", width=20, command=lambda: self.animated_solve("csp")).pack(pady=3)
+        tk.Button(controls, text="Cancel", width=20, command=self.cancel_run).pack(pady=3)
+        tk.Button(controls, text="Hint: reveal one safe cell", width=24, command=self.hint_one).pack(pady=(6,2))
 
         # Utilities
         tk.Label(controls, text="Utilities", font=("Helvetica",11,"bold")).pack(anchor="w", pady=(8,4))
         tk.Button(controls, text="Validate Board (highlights errors)", width=24, command=self.validate_board).pack(pady=2)
         tk.Button(controls, text="Clear Highlights", width=20, command=self.clear_highlights).pack(pady=2)
+        self.marks_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(controls, text="Show candidates", variable=self.marks_var,
+                       command=lambda: self.view.set_show_marks(self.marks_var.get())).pack(anchor="w", pady=2)
+        tk.Button(controls, text="Check unique solution", width=20, command=self.check_unique).pack(pady=2)
         tk.Button(controls, text="Reset (undo all)", width=20, command=self.reset_board).pack(pady=2)
         tk.Button(controls, text="Instructions", width=20, command=self.show_instructions).pack(pady=4)
-        tk.Button(controls, text="Exit", width=20, command=self.root.destroy).pack(pady=(6,2))
+        tk.Button(controls, text="Exit", width=20, command=self.exit_app).pack(pady=(6,2))
 
         # status & stats
         self.status_var = tk.StringVar(); self.status_var.set("Ready")
@@ -384,51 +297,40 @@ class SudokuApp:
         self.root.wait_window(pref)
 
     # ---------- helpers ----------
-    def _validate_cell(self, proposed):
-        if not proposed: return True
-        return proposed.isdigit() and len(proposed) <= 1 and '1' <= proposed <= '9'
-
-    def _on_edit(self, ev, r, c):
-        s = self.vars[r][c].get()
-        if not s:
-            if (r,c) in self.conflicts:
-                self.conflicts.discard((r,c))
-                self.entries[r][c].config(bg="#F2F2F2" if self.given[r][c] else "white")
-            return
-        if not s[0].isdigit() or s[0]=='0':
-            self.vars[r][c].set("")
-            return
-        self.vars[r][c].set(s[0])
-        if (r,c) in self.conflicts:
-            self.conflicts.discard((r,c))
-            self.entries[r][c].config(bg="#F2F2F2" if self.given[r][c] else "white")
-        self.status("Edited cell")
+    # Every change to a cell goes through the EditorModel, which reports the cell and its
+    # peers as the only ones whose conflict state or candidates can have changed; just
+    # those are repainted, so a keystroke never rescans the board.
+    def _on_edit(self, r, c):
+        self._refresh(self.model.set(r*9+c, self.view.value(r, c)))
+        self.status("Edited cell — conflict" if (r*9+c) in self.model.conflicts else "Edited cell")
+
+    def _put(self, r, c, v):
+        self.view.set_value(r, c, v)
+        self._refresh(self.model.set(r*9+c, v))
+
+    def _refresh(self, cells):
+        conflicts = self.model.conflicts
+        for i in cells:
+            r, c = divmod(i, 9)
+            self.view.set_bg(r, c, self.CONFLICT_BG if i in conflicts else None)
+            self.view.set_marks(r, c, self.model.candidates(i))
 
     def board_from_ui(self):
-        b = SudokuBoard()
-        for r in range(9):
-            for c in range(9):
-                s = self.vars[r][c].get().strip()
-                b.grid[r][c] = int(s[0]) if s and s[0].isdigit() else 0
-        return b
+        # the solvers start from a copy of the maintained board; no widget is read back
+        return self.model.snapshot()
 
     def set_ui_board(self, board: SudokuBoard, mark_given=True):
+        self.scheduler.cancel()
+        self.model.load(board, mark_given)
         for r in range(9):
             for c in range(9):
-                v = board.grid[r][c]
-                if v != 0 and mark_given:
-                    self.vars[r][c].set(str(v))
-                    self.entries[r][c].config(state='readonly', readonlybackground="#F2F2F2", fg="black")
-                    self.given[r][c] = True
-                else:
-                    self.vars[r][c].set("" if v==0 else str(v))
-                    self.entries[r][c].config(state='normal', bg="white", fg="black")
-                    self.given[r][c] = False
+                self.view.set_value(r, c, self.model.value(r*9+c))
+                self.view.set_given(r, c, self.model.given[r*9+c])
         self.clear_highlights()
         self.stats_var.set("")
 
     def push_history(self):
-        state = [[self.vars[r][c].get() for c in range(9)] for r in range(9)]
+        state = [list(row) for row in self.view.values]
         self.history.append(state)
         if len(self.history) > 40: self.history.pop(0)
 
@@ -437,13 +339,8 @@ class SudokuApp:
             self.status("No saved state to reset")
             return
         first = self.history[0]
-        for r in range(9):
-            for c in range(9):
-                self.vars[r][c].set(first[r][c])
-                self.entries[r][c].config(state='normal', bg="white")
-                self.given[r][c] = False
+        self.set_ui_board(SudokuBoard(first), mark_given=False)
         self.history.clear()
-        self.clear_highlights()
         self.status("Reset to first saved state")
 
     def status(self, text):
@@ -452,6 +349,30 @@ class SudokuApp:
     def show_stats(self, elapsed, nodes, backtracks):
         self.stats_var.set(f"Time: {elapsed:.4f}s    Nodes: {nodes}    Backtracks: {backtracks}")
 
+    # ---------- run control ----------
+    def _run_context(self, label):
+        # one solver run at a time: starting a new one cancels the previous. Every run builds
+        # its own solver, so a cancelled run still sees its own ctx while it winds down.
+        if self.run_ctx: self.run_ctx.cancel()
+        self.scheduler.cancel()
+        def progress(nodes, rate, depth):
+            self.root.after(0, lambda: self.status(f"{label}... {nodes} nodes ({rate:.0f}/s), depth {depth}"))
+        self.run_ctx = RunContext(progress=progress)
+        return self.run_ctx
+
+    def cancel_run(self):
+        if self.scheduler.running():
+            self.scheduler.cancel()
+            self.status("Animation cancelled")
+        elif self.run_ctx and not self.run_ctx.cancelled:
+            self.run_ctx.cancel()
+            self.status("Cancelling...")
+        else:
+            self.status("Nothing to cancel")
+
+    def _stopped(self, e):
+        self.root.after(0, lambda: self.status("Timed out" if isinstance(e, SolverTimeout) else "Cancelled"))
+
     # ---------- generate/upload/create ----------
     def generate_selected(self):
         diff = self.gen_combo.get()
@@ -459,11 +380,20 @@ class SudokuApp:
         self.generate_selected_fixed(diff)
 
     def generate_selected_fixed(self, difficulty):
+        p = self.pool.pop(difficulty)
+        if p is not None:
+            self.push_history(); self.set_ui_board(p, mark_given=True)
+            self.status(f"Generated {difficulty} puzzle")
+            return
         ok = messagebox.askyesno("Generate", f"Generate a {difficulty} puzzle? This may take a few seconds.")
         if not ok: return
         self.push_history(); self.status("Generating puzzle...")
+        ctx = self._run_context("Generating puzzle")
         def worker():
-            p = self.generator.make_puzzle(difficulty)
+            try:
+                p = self.generator.make_puzzle(difficulty, ctx=ctx)
+            except SolverCancelled as e:
+                return self._stopped(e)
             self.root.after(0, lambda: self.set_ui_board(p, mark_given=True))
             self.root.after(0, lambda: self.status(f"Generated {difficulty} puzzle"))
         threading.Thread(target=worker).start()
@@ -474,86 +404,70 @@ class SudokuApp:
         try:
             with open(path,'r') as f: raw = f.read()
             b = SudokuBoard.from_string(raw)
+            if b.n != 9:
+                raise ValueError(f"The editor handles 9x9 boards only; this file holds a {b.n}x{b.n} board "
+                                 "(use batch_solve.py or sudoku_core for larger sizes)")
             self.push_history(); self.set_ui_board(b, mark_given=True); self.status("Loaded puzzle from file")
         except Exception as e:
             messagebox.showerror("Upload error", str(e))
 
     def create_empty(self):
         self.push_history()
-        for r in range(9):
-            for c in range(9):
-                self.vars[r][c].set("")
-                self.entries[r][c].config(state='normal', bg="white")
-                self.given[r][c] = False
-        self.clear_highlights()
+        self.set_ui_board(SudokuBoard(), mark_given=False)
         self.status("Empty board created — you can edit cells")
 
     # ---------- validate / highlights ----------
     def validate_board(self):
-        b = self.board_from_ui()
-        conflicts = set()
-        # rows
-        for r in range(9):
-            seen = {}
-            for c in range(9):
-                v = b.grid[r][c]
-                if v==0: continue
-                if v in seen:
-                    conflicts.add((r,c)); conflicts.add((r,seen[v]))
-                else:
-                    seen[v]=c
-        # cols
-        for c in range(9):
-            seen = {}
-            for r in range(9):
-                v = b.grid[r][c]
-                if v==0: continue
-                if v in seen:
-                    conflicts.add((r,c)); conflicts.add((seen[v],c))
-                else:
-                    seen[v]=r
-        # boxes
-        for br in (0,3,6):
-            for bc in (0,3,6):
-                seen = {}
-                for i in range(br,br+3):
-                    for j in range(bc,bc+3):
-                        v = b.grid[i][j]
-                        if v==0: continue
-                        if v in seen:
-                            conflicts.add((i,j)); conflicts.add(seen[v])
-                        else:
-                            seen[v]=(i,j)
-        self.conflicts = conflicts
+        # conflicts are tracked and highlighted as cells change; this only reports them
+        conflicts = self.model.conflicts
         if not conflicts:
             self.status("Board valid: no immediate conflicts.")
-            for r in range(9):
-                for c in range(9):
-                    self.entries[r][c].config(bg="#F2F2F2" if self.given[r][c] else "white")
         else:
             self.status(f"Board has {len(conflicts)} conflicting cells (highlighted in red).")
-            for r in range(9):
-                for c in range(9):
-                    if (r,c) in conflicts:
-                        self.entries[r][c].config(bg="#FFB8B8")
-                    else:
-                        self.entries[r][c].config(bg="#F2F2F2" if self.given[r][c] else "white")
 
     def clear_highlights(self):
-        self.conflicts.clear()
-        for r in range(9):
-            for c in range(9):
-                self.entries[r][c].config(bg="#F2F2F2" if self.given[r][c] else "white")
+        # drops hint highlights; conflicting cells stay red until they are fixed
+        self.view.clear_bgs()
+        self._refresh(range(81))
         self.status("Highlights cleared")
 
+    def check_unique(self):
+        # counts up to two solutions with the search split over worker processes, so even a
+        # nearly empty hand-made board answers quickly
+        b = self.board_from_ui()
+        if not self.model.consistent():
+            self.status("Board has conflicts: no solution.")
+            return
+        self.status("Counting solutions...")
+        ctx = self._run_context("Counting solutions")
+        def worker():
+            try:
+                count = self.counter.count_solutions(b, limit=2, ctx=ctx)
+            except SolverCancelled as e:
+                return self._stopped(e)
+            text = {0: "No solution.", 1: "The puzzle has a unique solution."}.get(count, "More than one solution.")
+            self.root.after(0, lambda: self.status(text))
+        threading.Thread(target=worker).start()
+
     # ---------- hint (single cell) ----------
     def hint_one(self):
         b = self.board_from_ui()
-        if not b.is_consistent():
+        consistent = self.model.consistent()
+        if not consistent:
             if not messagebox.askyesno("Warning","Board has conflicts. Hint may be misleading. Continue?"): return
+        # a cell that can be proved by a logical technique needs no search at all
+        step = self.logic.next_step(b) if consistent else None
+        if step:
+            r, c, val, technique = step
+            self._apply_hint(r, c, val, f"Hint applied at ({r+1},{c+1}) = {val} [{technique}]")
+            return
         self.status("Computing hint (CSP)...")
+        ctx = self._run_context("Computing hint")
         def worker():
-            solved, elapsed, nodes, back = self.csp_solver.solve(b)
+            try:
+                solved, elapsed, nodes, back = self.solution_cache.solve(b, CSPSolver(), ctx=ctx)
+            except SolverCancelled as e:
+                return self._stopped(e)
             if not solved:
                 self.root.after(0, lambda: self.status("No hint: puzzle invalid or unsolvable."))
                 return
@@ -562,24 +476,31 @@ class SudokuApp:
                     if b.grid[r][c] == 0:
                         val = solved.grid[r][c]
                         def apply_hint(rr=r, cc=c, vv=val, el=elapsed, nd=nodes, bk=back):
-                            self.push_history()
-                            self.vars[rr][cc].set(str(vv))
-                            self.entries[rr][cc].config(bg="#DFF7DF")
+                            self._apply_hint(rr, cc, vv, f"Hint applied at ({rr+1},{cc+1}) = {vv}")
                             self.show_stats(el, nd, bk)
-                            self.status(f"Hint applied at ({rr+1},{cc+1}) = {vv}")
-                            self.root.after(1200, lambda: self.entries[rr][cc].config(bg="#F2F2F2" if self.given[rr][cc] else "white"))
                         self.root.after(0, apply_hint)
                         return
             self.root.after(0, lambda: self.status("Board complete — no hint available"))
         threading.Thread(target=worker).start()
 
+    def _apply_hint(self, r, c, val, text):
+        self.push_history()
+        self._put(r, c, val)
+        self.view.set_bg(r, c, self.HINT_BG)
+        self.status(text)
+        self.root.after(1200, lambda: self._refresh((r*9+c,)))
+
     # ---------- solvers ----------
     def solve_backtracking(self):
         b = self.board_from_ui()
-        if not b.is_consistent() and not messagebox.askyesno("Warning","Conflicts present. Try solve anyway?"): return
+        if not self.model.consistent() and not messagebox.askyesno("Warning","Conflicts present. Try solve anyway?"): return
         self.push_history(); self.status("Solving with Backtracking...")
+        ctx = self._run_context("Solving with Backtracking")
         def worker():
-            ok, elapsed, nodes, back = self.bt_solver.solve(b)
+            try:
+                ok, elapsed, nodes, back = BacktrackingSolver().solve(b, ctx=ctx)
+            except SolverCancelled as e:
+                return self._stopped(e)
             if ok:
                 self.root.after(0, lambda: self.set_ui_board(b, mark_given=False))
                 self.root.after(0, lambda: self.show_stats(elapsed,nodes,back))
@@ -590,10 +511,14 @@ class SudokuApp:
 
     def solve_csp(self):
         b = self.board_from_ui()
-        if not b.is_consistent() and not messagebox.askyesno("Warning","Conflicts present. Try solve anyway?"): return
+        if not self.model.consistent() and not messagebox.askyesno("Warning","Conflicts present. Try solve anyway?"): return
         self.push_history(); self.status("Solving with CSP...")
+        ctx = self._run_context("Solving with CSP")
         def worker():
-            solved, elapsed, nodes, back = self.csp_solver.solve(b)
+            try:
+                solved, elapsed, nodes, back = self.solution_cache.solve(b, CSPSolver(), ctx=ctx)
+            except SolverCancelled as e:
+                return self._stopped(e)
             if solved:
                 self.root.after(0, lambda: self.set_ui_board(solved, mark_given=False))
                 self.root.after(0, lambda: self.show_stats(elapsed,nodes,back))
@@ -602,13 +527,43 @@ class SudokuApp:
                 self.root.after(0, lambda: self.status("CSP could not find a solution"))
         threading.Thread(target=worker).start()
 
+    def solve_dlx(self):
+        b = self.board_from_ui()
+        if not self.model.consistent() and not messagebox.askyesno("Warning","Conflicts present. Try solve anyway?"): return
+        self.push_history(); self.status("Solving with Dancing Links...")
+        ctx = self._run_context("Solving with Dancing Links")
+        def worker():
+            try:
+                solved, elapsed, nodes, back = self.dlx_solver.solve(b, ctx=ctx)
+            except SolverCancelled as e:
+                return self._stopped(e)
+            if solved:
+                self.root.after(0, lambda: self.set_ui_board(solved, mark_given=False))
+                self.root.after(0, lambda: self.show_stats(elapsed,nodes,back))
+                self.root.after(0, lambda: self.status("Solved with Dancing Links"))
+            else:
+                self.root.after(0, lambda: self.status("DLX could not find a solution"))
+        threading.Thread(target=worker).start()
+
     def animated_solve(self, method="csp"):
+        # the solve runs on a worker; the fill-in is played back on the Tk loop by the
+        # frame scheduler, so no thread sleeps and each frame costs one canvas flush
         b = self.board_from_ui()
         self.push_history(); self.status("Preparing animation...")
-        if method=="csp":
-            solved, elapsed, nodes, back = self.csp_solver.solve(b)
-        else:
-            ok, elapsed, nodes, back = self.bt_solver.solve(b); solved = b if ok else None
+        ctx = self._run_context("Preparing animation")
+        def worker():
+            try:
+                if method=="csp":
+                    solved, elapsed, nodes, back = self.solution_cache.solve(b, CSPSolver(), ctx=ctx)
+                else:
+                    work = b.copy()
+                    ok, elapsed, nodes, back = BacktrackingSolver().solve(work, ctx=ctx); solved = work if ok else None
+            except SolverCancelled as e:
+                return self._stopped(e)
+            self.root.after(0, lambda: self._play_animation(b, solved, elapsed, nodes, back))
+        threading.Thread(target=worker).start()
+
+    def _play_animation(self, b, solved, elapsed, nodes, back):
         if not solved:
             self.status("No solution for animation")
             return
@@ -617,11 +572,18 @@ class SudokuApp:
             self.status("Nothing to animate (board complete)")
             return
         self.status("Animating solution...")
-        for r,c,val in cells:
-            time.sleep(self.animate_speed/1000.0)
-            self.root.after(0, lambda rr=r,cc=c,vv=val: self.vars[rr][cc].set(str(vv)))
-        self.root.after(0, lambda: self.show_stats(elapsed,nodes,back))
-        self.root.after(0, lambda: self.status("Animation complete"))
+        def done():
+            self.show_stats(elapsed,nodes,back)
+            self.status("Animation complete")
+        steps = [lambda rr=r,cc=c,vv=val: self._put(rr, cc, vv) for r,c,val in cells]
+        self.scheduler.play(steps, self.animate_speed, on_done=done)
+
+    def exit_app(self):
+        if self.run_ctx: self.run_ctx.cancel()
+        self.scheduler.cancel()
+        self.counter.close()
+        self.pool.close()
+        self.root.destroy()
 
     # ---------- instructions/help ----------
     def show_instructions(self):
@@ -631,11 +593,13 @@ class SudokuApp:
             "How to use this app:\n"
             "1) Generate: choose difficulty and press Generate to get a puzzle (unique solution).\n"
             "2) Upload: load an 81-character puzzle file (use 0 or . for blanks).\n"
-            "3) Create Empty Board: start typing your own puzzle.\n"
+            "3) Create Empty Board: click a cell and type 1–9 (Backspace clears, arrows move).\n"
             "4) Clues (from Generate/Upload) are readonly so you won't change given numbers by mistake.\n"
-            "5) Validate Board: highlights conflicting cells in red (persistent until you clear or fix them).\n"
-            "6) Hint (CSP): reveals one safe cell (green) — a small hint only.\n"
-            "7) Solve (Backtracking/CSP): compute full solution; use Animated Solve to watch filling.\n\n"
+            "5) Conflicting cells turn red as you type; Validate Board reports how many there are.\n"
+            "   Show candidates pencils in the digits still possible in each empty cell.\n"
+            "6) Hint: reveals one safe cell (green) and the technique that proves it;\n"
+            "   falls back to the CSP solver when no technique applies.\n"
+            "7) Solve (Backtracking/CSP/DLX): compute full solution; use Animated Solve to watch filling.\n\n"
             "Tips:\n- Validate before solving if you're unsure of your entries.\n- Use Reset to revert to the very first saved state.\n"
         )
         messagebox.showinfo("Instructions", instructions)
@@ -646,4 +610,4 @@ class SudokuApp:
 if __name__ == "__main__":
     root = tk.Tk()
     app = SudokuApp(root)
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()
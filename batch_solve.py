@@ -0,0 +1,136 @@
+"""
+batch_solve.py
+
+Headless batch solving: one puzzle per line (81 chars, 0 or . for blanks;
+256 or 625 chars with letters for 16x16 / 25x25), read from a file or stdin
+and solved on a process pool.
+
+    python batch_solve.py puzzles.txt -o solutions.tsv --engine dlx --workers 4
+    python batch_solve.py puzzles.txt --engine sat --dimacs cnf/   # also write CNF files
+    cat puzzles.txt | python batch_solve.py - > solutions.tsv
+    python batch_solve.py puzzles.sdkp -o solutions.tsv         # packed archive (puzzle_archive.py)
+
+Each output line is tab separated, in input order:
+    puzzle  solution  time_s  nodes  backtracks
+where solution is the solved puzzle string, "unsolvable", "invalid" or "timeout".
+"""
+
+import argparse, os, sys, time
+import multiprocessing as mp
+from collections import deque
+from itertools import islice
+
+from puzzle_archive import PuzzleArchive, is_archive
+from sudoku_core import SudokuBoard, BatchPropagator, SATSolver, RunContext, SolverTimeout, ENGINES, solve_board
+
+def read_puzzles(lines):
+    # skips blank lines and '#' comments
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            yield line
+
+def chunked(items, size):
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk: return
+        yield chunk
+
+def _parses(p):
+    return (len(p) == 81 and p.isdigit()) or sum(ch.isdigit() or ch == '.' for ch in p) >= 81
+
+def _vectorizable(p):
+    # BatchPropagator works on 9x9 boards only; SudokuBoard.from_string takes 16, 256 or 625
+    # cells as another size, so those lines go to the per-puzzle path
+    if len(p) == 81 and p.isdigit(): return True
+    return _parses(p) and sum(1 for ch in p if ch.isalnum() or ch == '.') not in (16, 256, 625)
+
+def _solve_one(engine, p, timeout=None):
+    try:
+        b = SudokuBoard.from_string(p)
+    except ValueError:
+        return (p, "invalid", 0.0, 0, 0)
+    ctx = RunContext(timeout=timeout) if timeout else None
+    try:
+        solved, elapsed, nodes, back = solve_board(b, engine, ctx)
+    except SolverTimeout:
+        return (p, "timeout", timeout, 0, 0)
+    return (p, solved.to_string() if solved else "unsolvable", elapsed, nodes, back)
+
+def solve_chunk(engine, puzzles, vectorized=False, timeout=None):
+    if not vectorized:
+        return [_solve_one(engine, p, timeout) for p in puzzles]
+    # propagate the 9x9 boards of the chunk as one tensor; only boards left open are searched
+    # by `engine`, and other sizes are solved one by one
+    out = []
+    res = iter(BatchPropagator(engine).solve_many([p for p in puzzles if _vectorizable(p)]))
+    for p in puzzles:
+        if not _vectorizable(p):
+            out.append(_solve_one(engine, p, timeout)); continue
+        sol, elapsed, nodes, back = next(res)
+        out.append((p, sol or "unsolvable", elapsed, nodes, back))
+    return out
+
+def solve_stream(puzzles, engine='dlx', workers=None, chunk_size=256, max_pending=None, vectorized=False,
+                 timeout=None):
+    # Generator of (puzzle, solution, elapsed, nodes, backtracks) in input order.
+    # At most max_pending chunks are in flight, so memory stays bounded however long the input is.
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine {engine!r}; choose from {', '.join(ENGINES)}")
+    if vectorized and timeout:
+        # the batch propagation and its searches run without a per-puzzle deadline
+        raise ValueError("timeout is not supported with vectorized solving")
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for chunk in chunked(puzzles, chunk_size):
+            yield from solve_chunk(engine, chunk, vectorized, timeout)
+        return
+    max_pending = max_pending or 2*workers
+    with mp.Pool(workers) as pool:
+        pending = deque()
+        for chunk in chunked(puzzles, chunk_size):
+            pending.append(pool.apply_async(solve_chunk, (engine, chunk, vectorized, timeout)))
+            if len(pending) >= max_pending:
+                yield from pending.popleft().get()
+        while pending:
+            yield from pending.popleft().get()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Solve a file of Sudoku puzzles (one per line).")
+    ap.add_argument("input", help="puzzle file, or - for stdin")
+    ap.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    ap.add_argument("-e", "--engine", default="dlx", choices=sorted(ENGINES))
+    ap.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    ap.add_argument("--chunk", type=int, default=256, help="puzzles per task sent to a worker")
+    ap.add_argument("--vectorized", action="store_true",
+                    help="propagate each chunk with NumPy first (use a larger --chunk, e.g. 4096)")
+    ap.add_argument("--timeout", type=float, default=None, help="per-puzzle time limit in seconds (not with --vectorized)")
+    ap.add_argument("--dimacs", metavar="DIR", help="also write each puzzle's CNF encoding to DIR/<n>.cnf")
+    args = ap.parse_args(argv)
+    if args.vectorized and args.timeout:
+        ap.error("--timeout cannot be combined with --vectorized")
+    if args.dimacs: os.makedirs(args.dimacs, exist_ok=True)
+
+    archive = args.input != "-" and is_archive(args.input)
+    fin = PuzzleArchive(args.input) if archive else sys.stdin if args.input == "-" else open(args.input)
+    fout = sys.stdout if args.output == "-" else open(args.output, "w")
+    total = solved = 0
+    start = time.perf_counter()
+    try:
+        results = solve_stream(iter(fin) if archive else read_puzzles(fin), args.engine, args.workers, args.chunk,
+                               vectorized=args.vectorized, timeout=args.timeout)
+        for p, sol, elapsed, nodes, back in results:
+            fout.write(f"{p}\t{sol}\t{elapsed:.6f}\t{nodes}\t{back}\n")
+            total += 1
+            if args.dimacs and sol != "invalid":
+                SATSolver().export_dimacs(SudokuBoard.from_string(p), os.path.join(args.dimacs, f"{total}.cnf"))
+            if sol not in ("unsolvable", "invalid", "timeout"): solved += 1
+    finally:
+        if fin is not sys.stdin: fin.close()
+        if fout is not sys.stdout: fout.close()
+    took = time.perf_counter() - start
+    print(f"{solved}/{total} solved in {took:.2f}s ({total/took if took else 0:.0f} puzzles/s)", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
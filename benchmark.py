@@ -0,0 +1,289 @@
+"""
+benchmark.py
+
+Reproducible solver benchmarks.
+
+suite: runs every engine on the shipped corpora (benchmarks/easy.txt,
+hard.txt and 17clue.txt) with warmup and repeated perf_counter timing, and
+records time, nodes, backtracks and peak memory (tracemalloc). Results can be
+written as JSON and compared against a saved baseline; the exit status is 1
+when a run is slower than the baseline by more than --tolerance or its node
+counts changed.
+
+    python benchmark.py suite --json results.json
+    python benchmark.py suite --save-baseline baseline.json     # e.g. on main
+    python benchmark.py suite --baseline baseline.json          # on the change
+
+profile: solves a corpus with an instrumented CSPSolver and sums its AC-3
+and search counters and per-phase times.
+
+    python benchmark.py profile hard --propagation gac
+
+scaling: generates puzzles at each board size from a fixed seed and reports
+how solve time and memory grow from 9x9 to 16x16 and 25x25.
+
+    python benchmark.py scaling --boxes 3 4 5 --count 5 --engines csp dlx
+
+imports: times fresh interpreters importing the solver core (what a pool
+worker pays before its first task) and the Tk frontend; the exit status is 1
+when a core import is over --budget-ms.
+
+    python benchmark.py imports --repeat 10 --budget-ms 30
+
+Time and memory are measured in separate runs, since tracemalloc slows the
+solver down. Runs over --timeout seconds are counted as timeouts.
+"""
+
+import argparse, json, os, platform, random, statistics, subprocess, sys, time, tracemalloc
+
+from sudoku_core import (Generator, SudokuBoard, CSPSolver, SearchStats, RunContext, SolverTimeout,
+                         ENGINES, solve_board)
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks")
+CORPORA = ("easy", "hard", "17clue")
+
+def read_corpus(name):
+    path = name if os.path.exists(name) else os.path.join(CORPUS_DIR, name + ".txt")
+    with open(path) as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+def measure(engine, puzzle, box=None, warmup=1, repeat=3, timeout=None):
+    # one puzzle: None on timeout, else dict of median/min seconds, nodes, backtracks, peak bytes
+    board = SudokuBoard.from_string(puzzle, box)
+    times = []
+    for k in range(warmup + repeat):
+        try:
+            start = time.perf_counter()
+            solved, _, nodes, back = solve_board(board, engine, RunContext(timeout=timeout) if timeout else None)
+            took = time.perf_counter() - start
+        except SolverTimeout:
+            return None
+        if k >= warmup: times.append(took)
+    tracemalloc.start()
+    try:
+        solve_board(board, engine)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"median_s": statistics.median(times), "min_s": min(times), "nodes": nodes,
+            "backtracks": back, "peak_bytes": peak, "solved": solved is not None}
+
+def run_suite(corpora, engines, warmup=1, repeat=3, timeout=10.0, progress=None):
+    results = {}
+    for corpus in corpora:
+        puzzles = read_corpus(corpus)
+        for engine in engines:
+            runs = []
+            for p in puzzles:
+                runs.append(measure(engine, p, warmup=warmup, repeat=repeat, timeout=timeout))
+                if progress: progress(corpus, engine, len(runs), len(puzzles))
+            done = [r for r in runs if r]
+            results.setdefault(corpus, {})[engine] = {
+                "puzzles": len(puzzles), "solved": sum(r["solved"] for r in done),
+                "timeouts": len(runs) - len(done),
+                "total_s": sum(r["median_s"] for r in done),
+                "best_s": sum(r["min_s"] for r in done),        # least noisy; used by compare()
+                "mean_s": statistics.mean(r["median_s"] for r in done) if done else None,
+                "max_s": max((r["median_s"] for r in done), default=None),
+                "nodes": sum(r["nodes"] for r in done), "backtracks": sum(r["backtracks"] for r in done),
+                "peak_bytes": max((r["peak_bytes"] for r in done), default=None),
+                "per_puzzle": runs,
+            }
+    return results
+
+def compare(results, baseline, tolerance=0.20, min_delta=0.005):
+    # rows of (corpus, engine, new best, old best, ratio, verdict); verdict "" when fine.
+    # Sums of per-puzzle best times are compared; differences under min_delta seconds are noise.
+    rows = []
+    for corpus, engines in results.items():
+        for engine, r in engines.items():
+            old = baseline.get(corpus, {}).get(engine)
+            if old is None:
+                rows.append((corpus, engine, r["best_s"], None, None, "new")); continue
+            ratio = r["best_s"] / old["best_s"] if old["best_s"] else None
+            verdict = ""
+            if r["timeouts"] > old["timeouts"] or r["solved"] < old["solved"]: verdict = "FAILED"
+            elif r["timeouts"] == old["timeouts"] == 0 and r["nodes"] != old["nodes"]: verdict = "NODES CHANGED"
+            elif abs(r["best_s"] - old["best_s"]) < min_delta: pass
+            elif ratio and ratio > 1 + tolerance: verdict = "SLOWER"
+            elif ratio and ratio < 1 - tolerance: verdict = "faster"
+            rows.append((corpus, engine, r["best_s"], old["best_s"], ratio, verdict))
+    return rows
+
+def print_results(results, out=sys.stdout):
+    print(f"{'corpus':<8}{'engine':<14}{'solved':>8}{'t/o':>5}{'total s':>11}{'mean ms':>10}{'max ms':>10}"
+          f"{'nodes':>11}{'backtracks':>12}{'peak KiB':>10}", file=out)
+    for corpus, engines in results.items():
+        for engine, r in engines.items():
+            solved = f"{r['solved']}/{r['puzzles']}"
+            if r["mean_s"] is None:
+                print(f"{corpus:<8}{engine:<14}{solved:>8}{r['timeouts']:>5}", file=out); continue
+            print(f"{corpus:<8}{engine:<14}{solved:>8}{r['timeouts']:>5}{r['total_s']:>11.4f}{r['mean_s']*1000:>10.2f}"
+                  f"{r['max_s']*1000:>10.2f}{r['nodes']:>11}{r['backtracks']:>12}{r['peak_bytes']/1024:>10.0f}", file=out)
+
+def suite_main(args):
+    def progress(corpus, engine, k, n):
+        print(f"\r{corpus} / {engine}: {k}/{n}", end="", file=sys.stderr, flush=True)
+    results = run_suite(args.corpora, args.engines, args.warmup, args.repeat, args.timeout, progress)
+    print(file=sys.stderr)
+    doc = {"meta": {"python": platform.python_version(), "platform": platform.platform(),
+                    "date": time.strftime("%Y-%m-%dT%H:%M:%S"), "warmup": args.warmup,
+                    "repeat": args.repeat, "timeout": args.timeout},
+           "results": results}
+    print_results(results)
+    for path in filter(None, (args.json, args.save_baseline)):
+        with open(path, "w") as f: json.dump(doc, f, indent=1)
+    if not args.baseline: return 0
+    with open(args.baseline) as f: base = json.load(f)["results"]
+    rows = compare(results, base, args.tolerance, args.min_delta)
+    print(f"\n{'corpus':<8}{'engine':<14}{'best s':>11}{'baseline':>11}{'ratio':>8}  verdict")
+    for corpus, engine, new, old, ratio, verdict in rows:
+        print(f"{corpus:<8}{engine:<14}{new:>11.4f}{old if old is not None else float('nan'):>11.4f}"
+              f"{ratio if ratio else float('nan'):>8.2f}  {verdict}")
+    return 1 if any(v in ("SLOWER", "FAILED", "NODES CHANGED") for *_, v in rows) else 0
+
+def profile_corpus(puzzles, timeout=None, propagation='ac3'):
+    # SearchStats counters and phases summed over the puzzles (max_depth is the maximum)
+    solver = CSPSolver(instrument=True, propagation=propagation)
+    total = SearchStats(); initial = dict.fromkeys(SearchStats.COUNTERS, 0)
+    nodes = backtracks = timeouts = 0
+    for p in puzzles:
+        try:
+            _, _, n, b = solver.solve(SudokuBoard.from_string(p), RunContext(timeout=timeout) if timeout else None)
+        except SolverTimeout:
+            timeouts += 1; continue
+        nodes += n; backtracks += b
+        st = solver.stats
+        for k in SearchStats.COUNTERS:
+            if k == "max_depth": total.max_depth = max(total.max_depth, st.max_depth)
+            else: setattr(total, k, getattr(total, k) + getattr(st, k))
+            initial[k] += st.initial.get(k, 0)
+        for k, v in st.phases.items(): total.phases[k] += v
+    total.initial = initial
+    return dict(total.as_dict(), puzzles=len(puzzles), timeouts=timeouts, nodes=nodes, backtracks=backtracks)
+
+def profile_main(args):
+    res = profile_corpus(read_corpus(args.corpus), args.timeout, args.propagation)
+    print(f"{res['puzzles']} puzzles, {res['timeouts']} timeouts, {res['nodes']} nodes, {res['backtracks']} backtracks")
+    print(f"\n{'counter':<24}{'total':>12}{'initial AC-3':>14}")
+    for k in SearchStats.COUNTERS:
+        print(f"{k:<24}{res[k]:>12}{res['initial'][k]:>14}")
+    spent = sum(res["phases"].values()) or 1
+    print(f"\n{'phase':<24}{'seconds':>12}{'share':>8}")
+    for k, v in res["phases"].items():
+        print(f"{k:<24}{v:>12.4f}{v/spent:>8.1%}")
+    if args.json:
+        with open(args.json, "w") as f: json.dump(res, f, indent=1)
+    return 0
+
+def make_puzzles(box, count, difficulty, seed):
+    random.seed(seed * 100 + box)
+    gen = Generator(box)
+    return [gen.make_puzzle(difficulty).to_string() for _ in range(count)]
+
+def scaling_main(args):
+    puzzles = {}
+    for box in args.boxes:
+        start = time.perf_counter()
+        puzzles[box] = make_puzzles(box, args.count, args.difficulty, args.seed)
+        print(f"generated {args.count} {box*box}x{box*box} puzzles in {time.perf_counter()-start:.2f}s")
+
+    print(f"\n{'engine':<14}{'size':<8}{'solved':>8}{'median s':>12}{'x time':>9}{'nodes':>10}{'peak KiB':>10}{'x mem':>8}")
+    for engine in args.engines:
+        base = None
+        for box in args.boxes:
+            runs = [r for r in (measure(engine, p, box, args.warmup, args.repeat, args.timeout) for p in puzzles[box]) if r]
+            size = f"{box*box}x{box*box}"
+            if not runs:
+                print(f"{engine:<14}{size:<8}{f'0/{args.count}':>8}{'timeout':>12}")
+                continue
+            t = statistics.median(r["median_s"] for r in runs)
+            peak = max(r["peak_bytes"] for r in runs)
+            nodes = statistics.mean(r["nodes"] for r in runs)
+            base = base or (t, peak)
+            print(f"{engine:<14}{size:<8}{f'{len(runs)}/{args.count}':>8}{t:>12.4f}{t/base[0]:>9.1f}"
+                  f"{nodes:>10.0f}{peak/1024:>10.0f}{peak/base[1]:>8.1f}")
+    return 0
+
+# statement timed in a fresh interpreter -> whether it counts against the import budget
+IMPORT_TARGETS = {
+    "from sudoku_core import DLXSolver": True,
+    "from sudoku_core import CSPSolver, Generator": True,
+    "from sudoku_core import ENGINES, solve_board": True,
+    "import FOA_Implementation": False,
+}
+
+def time_import(stmt, repeat=5):
+    # (median, min) seconds for `stmt` in new interpreters, excluding interpreter start-up;
+    # raises RuntimeError if the import fails
+    code = f"import time; t = time.perf_counter(); {stmt}; print(time.perf_counter() - t)"
+    here = os.path.dirname(os.path.abspath(__file__))
+    times = []
+    for _ in range(repeat):
+        res = subprocess.run([sys.executable, "-c", code], cwd=here, capture_output=True, text=True)
+        if res.returncode:
+            raise RuntimeError(res.stderr.strip().splitlines()[-1] if res.stderr.strip() else "import failed")
+        times.append(float(res.stdout.split()[-1]))
+    return statistics.median(times), min(times)
+
+def imports_main(args):
+    rows = {}; over = False
+    print(f"{'import':<48}{'median ms':>11}{'min ms':>9}  budget")
+    for stmt, budgeted in IMPORT_TARGETS.items():
+        try:
+            med, best = time_import(stmt, args.repeat)
+        except RuntimeError as e:
+            rows[stmt] = {"error": str(e)}
+            print(f"{stmt:<48}{'failed':>11}  {e}"); continue
+        verdict = ""
+        if budgeted:
+            verdict = "OVER" if med * 1000 > args.budget_ms else "ok"
+            over |= verdict == "OVER"
+        rows[stmt] = {"median_s": med, "min_s": best, "budgeted": budgeted}
+        print(f"{stmt:<48}{med*1000:>11.1f}{best*1000:>9.1f}  {verdict}")
+    if args.json:
+        with open(args.json, "w") as f: json.dump({"budget_ms": args.budget_ms, "imports": rows}, f, indent=1)
+    return 1 if over else 0
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Sudoku solver benchmarks.")
+    sub = ap.add_subparsers(dest="mode", required=True)
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--warmup", type=int, default=1, help="untimed runs per puzzle")
+    common.add_argument("--repeat", type=int, default=3, help="timed runs per puzzle (median is reported)")
+
+    s = sub.add_parser("suite", parents=[common], help="all engines on the shipped corpora")
+    s.add_argument("--corpora", nargs="+", default=list(CORPORA), help="corpus names or puzzle files")
+    s.add_argument("--engines", nargs="+", default=list(ENGINES), choices=sorted(ENGINES))
+    s.add_argument("--timeout", type=float, default=10.0, help="per-puzzle time limit in seconds")
+    s.add_argument("--json", help="write results as JSON")
+    s.add_argument("--save-baseline", help="write results as a baseline file")
+    s.add_argument("--baseline", help="compare against a saved baseline; exit 1 on regressions")
+    s.add_argument("--tolerance", type=float, default=0.20, help="allowed slowdown before flagging (0.20 = 20%%)")
+    s.add_argument("--min-delta", type=float, default=0.005, help="ignore differences under this many seconds")
+
+    pr = sub.add_parser("profile", help="instrumented CSP counters and phase times on one corpus")
+    pr.add_argument("corpus", help="corpus name or puzzle file")
+    pr.add_argument("--timeout", type=float, default=None, help="per-puzzle time limit in seconds")
+    pr.add_argument("--propagation", default="ac3", choices=CSPSolver.PROPAGATION)
+    pr.add_argument("--json", help="write the totals as JSON")
+
+    c = sub.add_parser("scaling", parents=[common], help="time and memory across board sizes")
+    c.add_argument("--boxes", type=int, nargs="+", default=[3, 4, 5], help="box sizes (3 = 9x9, 4 = 16x16, 5 = 25x25)")
+    c.add_argument("--engines", nargs="+", default=["csp", "dlx"], choices=sorted(ENGINES))
+    c.add_argument("--count", type=int, default=3, help="puzzles per board size")
+    c.add_argument("--difficulty", default="Medium", choices=["Easy", "Medium", "Hard"])
+    c.add_argument("--seed", type=int, default=1)
+    c.add_argument("--timeout", type=float, default=30.0, help="per-puzzle time limit in seconds")
+
+    im = sub.add_parser("imports", help="import time of the solver core and the GUI module")
+    im.add_argument("--repeat", type=int, default=5, help="fresh interpreters per import (median is reported)")
+    im.add_argument("--budget-ms", type=float, default=30.0, help="limit for core imports; exit 1 when over")
+    im.add_argument("--json", help="write the timings as JSON")
+
+    args = ap.parse_args(argv)
+    return {"suite": suite_main, "profile": profile_main, "scaling": scaling_main,
+            "imports": imports_main}[args.mode](args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+"""
+puzzle_archive.py
+
+Packed binary puzzle archives: fixed-size records at 4 bits per cell, so a
+9x9 puzzle takes 41 bytes instead of an 82-byte text line, with an optional
+solution column of the same size.
+
+    python puzzle_archive.py pack puzzles.txt puzzles.sdkp
+    python puzzle_archive.py pack solutions.tsv solved.sdkp --solutions   # batch_solve.py output
+    python puzzle_archive.py unpack puzzles.sdkp -o puzzles.txt
+    python puzzle_archive.py info puzzles.sdkp
+
+Layout (little endian):
+    header   32 bytes: magic "SDKPACK1", version u16, box u8, column count u8,
+             bits per cell u8, 3 pad bytes, record count u64, index offset u64
+    columns  one after another, each `count` records of ceil(n*n/2) bytes;
+             cells are nibbles, high nibble first, 0 for a blank
+    index    one 24-byte entry per column: name (8 bytes, NUL padded),
+             data offset u64, record size u32, 4 pad bytes
+
+The nibbles of a 9x9 record are the puzzle's digits as hex, so packing and
+unpacking go through bytes.fromhex / bytes.hex. Boards up to 9x9 (box 2 or
+3) fit in 4 bits per cell. Both converters stream: the writer spills the
+solution column to a temporary file and appends it on close, and
+PuzzleArchive memory-maps the file, so records are read straight from the
+page cache and slicing an archive copies nothing.
+"""
+
+import argparse, mmap, os, shutil, struct, sys, tempfile
+
+MAGIC = b"SDKPACK1"
+VERSION = 1
+HEADER = struct.Struct("<8sHBBB3xQQ")
+INDEX_ENTRY = struct.Struct("<8sQI4x")
+_TO_DIGITS = str.maketrans(".", "0")
+
+def record_size(box):
+    return (box**4 + 1) // 2
+
+def pack_record(s, size):
+    # an n*n-character puzzle string (digits, 0 or . for blanks) -> `size` packed bytes
+    s = s.translate(_TO_DIGITS)
+    return bytes.fromhex(s + "0" * (2*size - len(s)))
+
+def unpack_record(rec, ncells):
+    return rec.hex()[:ncells]
+
+class ArchiveWriter:
+    # Appends puzzles (and solutions, if with_solutions) to a new archive; close() writes the
+    # index and header. Use as a context manager.
+    def __init__(self, path, box=3, with_solutions=False):
+        if box not in (2, 3):
+            raise ValueError("packed archives hold boards up to 9x9 (box 2 or 3)")
+        self.path = path; self.box = box
+        self.ncells = box**4
+        self.size = record_size(box)
+        self.count = 0
+        self.f = open(path, "wb")
+        self.f.write(b"\0" * HEADER.size)
+        self.spill = tempfile.TemporaryFile() if with_solutions else None
+
+    def add(self, puzzle, solution=None):
+        for s in (puzzle, solution) if self.spill else (puzzle,):
+            if s is None or len(s) != self.ncells or not s.translate(_TO_DIGITS).isdigit():
+                raise ValueError(f"expected {self.ncells} digits (0 or . for blanks), got {s!r}")
+        self.f.write(pack_record(puzzle, self.size))
+        if self.spill: self.spill.write(pack_record(solution, self.size))
+        self.count += 1
+
+    def close(self):
+        if self.f is None: return
+        columns = [(b"puzzle", HEADER.size)]
+        if self.spill:
+            columns.append((b"solution", self.f.tell()))
+            self.spill.seek(0)
+            shutil.copyfileobj(self.spill, self.f)
+            self.spill.close()
+        index_offset = self.f.tell()
+        for name, offset in columns:
+            self.f.write(INDEX_ENTRY.pack(name, offset, self.size))
+        self.f.seek(0)
+        self.f.write(HEADER.pack(MAGIC, VERSION, self.box, len(columns), 4, self.count, index_offset))
+        self.f.close(); self.f = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class PuzzleArchive:
+    # Read-only view of an archive. The file is memory-mapped: archive[i] decodes one puzzle,
+    # record(i) is a memoryview of its packed bytes, archive[a:b:k] is another view over the
+    # same mapping. Only the archive that opened the file closes it: close() on a view does
+    # nothing, and views (and record() memoryviews) are unusable once it is closed. Release
+    # the memoryviews from record() before closing, or close() raises BufferError.
+    def __init__(self, path=None, _parent=None, _range=None):
+        if _parent is not None:
+            self.__dict__.update(_parent.__dict__)
+            self._range = _range
+            return
+        self._root = self                                    # the archive that owns the mapping
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.box, ncols, bits, count, index_offset = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION or bits != 4:
+            raise ValueError(f"{path}: not a version {VERSION} puzzle archive")
+        self.ncells = self.box**4
+        self.columns = {}
+        for k in range(ncols):
+            name, offset, size = INDEX_ENTRY.unpack_from(self._mm, index_offset + k*INDEX_ENTRY.size)
+            self.columns[name.rstrip(b"\0").decode()] = (offset, size)
+        self.size = record_size(self.box)
+        self._view = memoryview(self._mm)
+        self._range = range(count)
+
+    @property
+    def has_solutions(self):
+        return "solution" in self.columns
+
+    def __len__(self):
+        return len(self._range)
+
+    def record(self, i, column="puzzle"):
+        offset, size = self.columns[column]
+        start = offset + self._range[i] * size
+        return self._root._view[start:start+size]
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return PuzzleArchive(_parent=self, _range=self._range[i])
+        return unpack_record(self.record(i), self.ncells)
+
+    def __iter__(self):
+        for i in range(len(self)): yield self[i]
+
+    def solution(self, i):
+        return unpack_record(self.record(i, "solution"), self.ncells)
+
+    def board(self, i):
+        from sudoku_core import SudokuBoard
+        return SudokuBoard.from_string(self[i], self.box)
+
+    def close(self):
+        if self._root is not self or self._mm.closed: return
+        self._view.release()
+        try:
+            self._mm.close()
+        except BufferError:
+            self._view = memoryview(self._mm)          # still open and usable
+            raise BufferError("release the memoryviews returned by record() before closing the archive") from None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def is_archive(path):
+    try:
+        with open(path, "rb") as f: return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+def pack_text(lines, path, with_solutions=False, box=3):
+    # puzzle lines, or batch_solve.py TSV lines (puzzle, solution, ...) when with_solutions;
+    # blank lines and '#' comments are skipped, as are unsolved rows. Returns the count written.
+    with ArchiveWriter(path, box, with_solutions) as w:
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith("#"): continue
+            if with_solutions:
+                parts = line.split("\t")
+                if len(parts) < 2 or not parts[1].isdigit(): continue
+                w.add(parts[0], parts[1])
+            else:
+                w.add(line)
+        return w.count
+
+def unpack_text(path, out):
+    # writes one puzzle per line, followed by a tab and the solution if the archive has them
+    with PuzzleArchive(path) as a:
+        sols = a.has_solutions
+        for i in range(len(a)):
+            out.write(f"{a[i]}\t{a.solution(i)}\n" if sols else a[i] + "\n")
+        return len(a)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Convert between text puzzles and packed puzzle archives.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("pack", help="text (one puzzle per line) -> archive")
+    p.add_argument("input", help="puzzle file, or - for stdin")
+    p.add_argument("output")
+    p.add_argument("--solutions", action="store_true",
+                   help="input is batch_solve.py output; store the solution column too")
+    p.add_argument("--box", type=int, default=3, choices=(2, 3))
+    p = sub.add_parser("unpack", help="archive -> text")
+    p.add_argument("input")
+    p.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    p = sub.add_parser("info", help="print an archive's header")
+    p.add_argument("input")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "pack":
+        fin = sys.stdin if args.input == "-" else open(args.input)
+        try:
+            n = pack_text(fin, args.output, args.solutions, args.box)
+        finally:
+            if fin is not sys.stdin: fin.close()
+        print(f"{n} puzzles packed into {args.output} ({os.path.getsize(args.output)} bytes)", file=sys.stderr)
+    elif args.cmd == "unpack":
+        fout = sys.stdout if args.output == "-" else open(args.output, "w")
+        try:
+            unpack_text(args.input, fout)
+        finally:
+            if fout is not sys.stdout: fout.close()
+    else:
+        with PuzzleArchive(args.input) as a:
+            n = a.box * a.box
+            print(f"{len(a)} puzzles, {n}x{n}, {a.size} bytes per record, columns: {', '.join(a.columns)}")
+
+if __name__ == "__main__":
+    main()
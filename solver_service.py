@@ -0,0 +1,326 @@
+"""
+solver_service.py
+
+Headless solver service: a small asyncio HTTP server on localhost that
+solves Sudoku puzzles on a warm process pool, without Tk.
+
+    python solver_service.py --port 8765 --workers 4 --engine dlx
+
+POST /solve with a JSON body, either one puzzle or a list:
+    {"puzzle": "003020600...", "engine": "dlx", "deadline_ms": 2000}
+    {"puzzles": ["...", "..."], "engine": "csp"}
+and get back one result per puzzle:
+    {"puzzle": ..., "status": "solved", "solution": ..., "time_s": ..., "nodes": ..., "backtracks": ...}
+where status is "solved", "unsolvable", "invalid" or "timeout".
+
+GET /metrics reports queue depth, in-flight puzzles, batch sizes, result
+counts and request latency percentiles. GET /health answers "ok".
+
+Puzzles arriving within --window-ms of each other are batched (up to
+--max-batch) and split across the workers, so many small requests cost a
+few pool round trips. At most --max-queue puzzles are accepted and not yet
+answered; beyond that requests are refused with 503 and Retry-After. A puzzle still queued
+at its deadline is answered "timeout" without being solved, and the worker
+stops a search that runs past it.
+"""
+
+import argparse, asyncio, json, os, sys, time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from sudoku_core import SudokuBoard, RunContext, SolverTimeout, ENGINES, geometry, solve_board
+
+# -----------------------------
+# Worker side
+# -----------------------------
+def _warm():
+    # runs once per worker process: build the per-size tables before the first request
+    for box in (3, 4):
+        geometry(box)
+    solve_board(SudokuBoard(), 'dlx')
+
+def _ping():
+    return os.getpid()
+
+def solve_jobs(engine, jobs):
+    # jobs: [(puzzle, seconds left at the call or None)] -> [(status, solution, elapsed, nodes, backtracks)]
+    out = []
+    start = time.perf_counter()
+    for p, left in jobs:
+        try:
+            b = SudokuBoard.from_string(p)
+        except ValueError:
+            out.append(("invalid", None, 0.0, 0, 0)); continue
+        if left is not None:
+            left -= time.perf_counter() - start           # earlier puzzles of the chunk used some of it
+            if left <= 0:
+                out.append(("timeout", None, 0.0, 0, 0)); continue
+        t0 = time.perf_counter()
+        try:
+            solved, elapsed, nodes, back = solve_board(b, engine, RunContext(timeout=left) if left else None)
+        except SolverTimeout:
+            out.append(("timeout", None, time.perf_counter() - t0, 0, 0)); continue
+        out.append(("solved" if solved else "unsolvable", solved.to_string() if solved else None,
+                     elapsed, nodes, back))
+    return out
+
+# -----------------------------
+# Batching and metrics
+# -----------------------------
+class Overloaded(Exception):
+    pass
+
+class _Job:
+    __slots__ = ("puzzle", "engine", "deadline", "future")
+    def __init__(self, puzzle, engine, deadline, future):
+        self.puzzle, self.engine, self.deadline, self.future = puzzle, engine, deadline, future
+
+def percentile(sorted_vals, q):
+    if not sorted_vals: return None
+    k = min(len(sorted_vals) - 1, max(0, int(round(q * (len(sorted_vals) - 1)))))
+    return sorted_vals[k]
+
+class SolverService:
+    def __init__(self, workers=None, engine='dlx', window_ms=5.0, max_batch=64, max_queue=1024,
+                 deadline_ms=10000, latency_window=2048):
+        self.workers = workers or os.cpu_count() or 1
+        self.engine = engine
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self.max_queue = max_queue
+        self.deadline = deadline_ms / 1000.0 if deadline_ms else None
+        self.queue = None; self.pool = None; self._batcher = None
+        self.pending = 0       # puzzles accepted and not yet finished: queued, batched or solving
+        self.in_flight = 0     # of which running on the pool
+        self.latencies = deque(maxlen=latency_window)    # seconds, most recent requests
+        self.counts = {"requests": 0, "rejected": 0, "batches": 0, "batched_puzzles": 0,
+                       "solved": 0, "unsolvable": 0, "invalid": 0, "timeout": 0}
+
+    async def start(self):
+        self.queue = asyncio.Queue()
+        self.pool = ProcessPoolExecutor(self.workers, initializer=_warm)
+        loop = asyncio.get_running_loop()
+        # start every worker now so the first request doesn't pay for process start-up
+        await asyncio.gather(*(loop.run_in_executor(self.pool, _ping) for _ in range(self.workers)))
+        self._slots = asyncio.Semaphore(2 * self.workers)
+        self._batcher = asyncio.create_task(self._batch_loop())
+
+    async def stop(self):
+        if self._batcher: self._batcher.cancel()
+        if self.pool: self.pool.shutdown(cancel_futures=True)
+
+    async def solve(self, puzzles, engine=None, deadline_ms=None):
+        # results in input order; raises Overloaded if the queue cannot take them all
+        engine = engine or self.engine
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}; choose from {', '.join(ENGINES)}")
+        if len(puzzles) > self.max_queue:
+            raise ValueError(f"at most {self.max_queue} puzzles per request")
+        if self.pending + len(puzzles) > self.max_queue:
+            self.counts["rejected"] += 1
+            raise Overloaded(f"queue full ({self.pending} puzzles pending)")
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        limit = deadline_ms / 1000.0 if deadline_ms else self.deadline
+        deadline = start + limit if limit else None
+        self.counts["requests"] += 1
+        jobs = [_Job(p, engine, deadline, loop.create_future()) for p in puzzles]
+        for job in jobs: self.queue.put_nowait(job)
+        self.pending += len(jobs)
+        try:
+            if deadline is None:
+                return list(await asyncio.gather(*(j.future for j in jobs)))
+            # the worker also stops at the deadline; the margin covers the trip back
+            return list(await asyncio.wait_for(asyncio.gather(*(j.future for j in jobs)), limit + 1.0))
+        finally:
+            # pending drops as each job leaves the pool (_finish / _run_chunk), not here: a
+            # request that timed out may still have its puzzles running
+            self.latencies.append(loop.time() - start)
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            close = loop.time() + self.window
+            while len(batch) < self.max_batch:
+                left = close - loop.time()
+                if left <= 0: break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), left))
+                except asyncio.TimeoutError:
+                    break
+            await self._slots.acquire()
+            asyncio.create_task(self._dispatch(batch))
+
+    async def _dispatch(self, batch):
+        loop = asyncio.get_running_loop()
+        try:
+            now = loop.time()
+            live = []
+            for job in batch:
+                if job.future.done():                          # the request already gave up
+                    self.pending -= 1; continue
+                if job.deadline is not None and job.deadline <= now:
+                    self._finish(job, ("timeout", None, 0.0, 0, 0))
+                else:
+                    live.append(job)
+            if not live: return
+            self.counts["batches"] += 1; self.counts["batched_puzzles"] += len(live)
+            by_engine = {}
+            for job in live: by_engine.setdefault(job.engine, []).append(job)
+            tasks = []
+            for engine, jobs in by_engine.items():
+                # one chunk per worker, so a batch is spread over the whole pool
+                size = -(-len(jobs) // self.workers)
+                for i in range(0, len(jobs), size):
+                    tasks.append(self._run_chunk(engine, jobs[i:i+size]))
+            self.in_flight += len(live)
+            try:
+                await asyncio.gather(*tasks)
+            finally:
+                self.in_flight -= len(live)
+        finally:
+            self._slots.release()
+
+    async def _run_chunk(self, engine, jobs):
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        items = [(j.puzzle, None if j.deadline is None else j.deadline - now) for j in jobs]
+        try:
+            results = await loop.run_in_executor(self.pool, solve_jobs, engine, items)
+        except Exception as e:
+            self.pending -= len(jobs)
+            for job in jobs:
+                if not job.future.done(): job.future.set_exception(e)
+            return
+        for job, res in zip(jobs, results):
+            self._finish(job, res)
+
+    def _finish(self, job, res):
+        status, solution, elapsed, nodes, back = res
+        self.counts[status] += 1
+        self.pending -= 1
+        if not job.future.done():
+            job.future.set_result({"puzzle": job.puzzle, "status": status, "solution": solution,
+                                   "time_s": elapsed, "nodes": nodes, "backtracks": back})
+
+    def metrics(self):
+        lat = sorted(self.latencies)
+        ms = lambda q: None if not lat else round(percentile(lat, q) * 1000, 3)
+        batches = self.counts["batches"]
+        return {"queue_depth": max(0, self.pending - self.in_flight), "in_flight": self.in_flight,
+                "workers": self.workers, "max_queue": self.max_queue, **self.counts,
+                "mean_batch": self.counts["batched_puzzles"] / batches if batches else None,
+                "latency_ms": {"p50": ms(0.50), "p90": ms(0.90), "p99": ms(0.99), "max": ms(1.0),
+                               "samples": len(lat)}}
+
+# -----------------------------
+# HTTP front end
+# -----------------------------
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable", 504: "Gateway Timeout"}
+MAX_BODY = 16 * 1024 * 1024
+
+async def _respond(writer, code, payload, extra=()):
+    body = (payload if isinstance(payload, str) else json.dumps(payload)).encode()
+    head = [f"HTTP/1.1 {code} {REASONS[code]}", "Content-Type: application/json",
+            f"Content-Length: {len(body)}", "Connection: close", *extra]
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + body)
+    await writer.drain()
+
+async def _handle_solve(service, body):
+    req = json.loads(body or b"{}")
+    if not isinstance(req, dict):
+        raise ValueError("expected a JSON object")
+    deadline_ms = req.get("deadline_ms")
+    if deadline_ms is not None and (isinstance(deadline_ms, bool) or not isinstance(deadline_ms, (int, float))
+                                    or not deadline_ms > 0):
+        raise ValueError('"deadline_ms" must be a positive number')
+    if not isinstance(req.get("engine", ""), (str, type(None))):
+        raise ValueError('"engine" must be a string')
+    single = "puzzle" in req
+    puzzles = [req["puzzle"]] if single else req.get("puzzles")
+    if not isinstance(puzzles, list) or not all(isinstance(p, str) for p in puzzles):
+        raise ValueError('expected "puzzle": string or "puzzles": [string, ...]')
+    results = await service.solve(puzzles, req.get("engine"), deadline_ms)
+    return results[0] if single else {"results": results}
+
+def make_handler(service):
+    async def handle(reader, writer):
+        try:
+            request = await reader.readline()
+            parts = request.decode("latin-1").split()
+            if len(parts) < 2: return
+            method, path = parts[0], parts[1].split("?")[0]
+            length = "0"
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""): break
+                name, _, value = line.decode("latin-1").partition(":")
+                if name.strip().lower() == "content-length": length = value.strip()
+            if not (length.isascii() and length.isdigit()):
+                return await _respond(writer, 400, {"error": "Content-Length must be a non-negative integer"})
+            length = int(length)
+            if length > MAX_BODY:
+                return await _respond(writer, 413, {"error": "request too large"})
+            body = await reader.readexactly(length) if length else b""
+            if path == "/health":
+                await _respond(writer, 200, {"status": "ok"})
+            elif path == "/metrics":
+                await _respond(writer, 200, service.metrics())
+            elif path == "/solve":
+                if method != "POST": return await _respond(writer, 405, {"error": "use POST"})
+                try:
+                    await _respond(writer, 200, await _handle_solve(service, body))
+                except Overloaded as e:
+                    await _respond(writer, 503, {"error": str(e)}, ("Retry-After: 1",))
+                except asyncio.TimeoutError:
+                    await _respond(writer, 504, {"error": "deadline exceeded"})
+                except (ValueError, KeyError) as e:
+                    await _respond(writer, 400, {"error": str(e)})
+                except Exception as e:
+                    # a worker failure or a bug: the client still gets an answer
+                    await _respond(writer, 500, {"error": f"{type(e).__name__}: {e}"})
+            else:
+                await _respond(writer, 404, {"error": f"no route {path}"})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+    return handle
+
+async def serve(host="127.0.0.1", port=8765, ready=None, **options):
+    # runs until cancelled; `ready(server)` is called once the socket is listening
+    service = SolverService(**options)
+    await service.start()
+    server = await asyncio.start_server(make_handler(service), host, port)
+    if ready: ready(server)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Serve Sudoku solving over HTTP on localhost.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("-e", "--engine", default="dlx", choices=sorted(ENGINES), help="default engine")
+    ap.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    ap.add_argument("--window-ms", type=float, default=5.0, help="how long a batch waits for more puzzles")
+    ap.add_argument("--max-batch", type=int, default=64, help="puzzles per batch")
+    ap.add_argument("--max-queue", type=int, default=1024, help="queued puzzles before requests get 503")
+    ap.add_argument("--deadline-ms", type=float, default=10000, help="default per-request deadline (0: none)")
+    args = ap.parse_args(argv)
+    def ready(server):
+        addr = server.sockets[0].getsockname()
+        print(f"listening on http://{addr[0]}:{addr[1]}", file=sys.stderr)
+    try:
+        asyncio.run(serve(args.host, args.port, ready, workers=args.workers, engine=args.engine,
+                          window_ms=args.window_ms, max_batch=args.max_batch, max_queue=args.max_queue,
+                          deadline_ms=args.deadline_ms))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+sudoku_core
+
+The board model, solvers and generator, with no GUI dependency: scripts and
+worker processes import this package, and FOA_Implementation.py is the Tk
+frontend on top of it.
+
+Names are imported lazily: `from sudoku_core import DLXSolver` loads the
+board model and the DLX module only, so a pool worker does not pay for the
+engines it never runs.
+"""
+
+import importlib
+
+_EXPORTS = {
+    'board': ('SudokuBoard', 'Geometry', 'geometry', 'SYMBOLS', 'CELLS', 'UNIT_LIST', 'UNITS',
+              'PEERS_RC', 'PEERS', 'ARCS_RC', 'ARCS'),
+    'context': ('RunContext', 'SolverCancelled', 'SolverTimeout'),
+    'backtracking': ('BacktrackingSolver',),
+    'csp': ('CSPSolver', 'SearchStats'),
+    'logic': ('LogicSolver',),
+    'dlx': ('DLXSolver',),
+    'sat': ('SATSolver', 'CDCL', 'sudoku_cnf', 'to_dimacs'),
+    'batch': ('BatchPropagator',),
+    'generator': ('Generator', 'UniquenessChecker'),
+    'engines': ('ENGINES', 'ENUMERATORS', 'solve_board', 'iter_solutions'),
+    'parallel': ('ParallelSearch', 'split_frontier'),
+    'cache': ('SolutionCache', 'canonical_form'),
+    'pool': ('PuzzlePool', 'DIFFICULTIES'),
+    'editor': ('EditorModel',),
+    'transposition': ('TranspositionTable', 'zobrist', 'board_key'),
+    'variation': ('VariationSummary', 'summarize'),
+}
+_MODULE_OF = {name: mod for mod, names in _EXPORTS.items() for name in names}
+__all__ = sorted(_MODULE_OF)
+
+def __getattr__(name):
+    mod = _MODULE_OF.get(name)
+    if mod is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{mod}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
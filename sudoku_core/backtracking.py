@@ -0,0 +1,142 @@
+"""Plain backtracking solver."""
+
+import time
+
+from .board import SudokuBoard
+from .context import SolverCancelled
+from .transposition import zobrist, board_key
+
+# -----------------------------
+# Backtracking solver
+# -----------------------------
+class BacktrackingSolver:
+    # preprocess: optional LogicSolver whose deductions are filled in before the search.
+    # table: optional TranspositionTable; count_solutions() then looks up every state it
+    # reaches and stores the exact count of each subtree it finishes (see transposition.py)
+    def __init__(self, preprocess=None, table=None):
+        self.nodes = 0
+        self.backtracks = 0
+        self.preprocess = preprocess
+        self.table = table
+
+    # ctx: optional RunContext; if it cancels, SolverCancelled propagates and the board is
+    # restored to how it was passed in. ctx is passed down the search rather than kept on
+    # the solver, so a run always sees its own cancel flag.
+    def solve(self, board: SudokuBoard, limit_nodes=None, ctx=None):
+        self.nodes = 0
+        self.backtracks = 0
+        start = time.perf_counter()
+        # taken before propagation: unless a solution is returned (contradiction, node limit,
+        # cancel) the board is reset, including the cells the preprocessor filled
+        empty = [i for i,v in enumerate(board.cells) if not v]
+        ok = False
+        try:
+            if not (self.preprocess and self.preprocess.propagate(board) is None):
+                ok = self._dfs(board, limit_nodes, ctx)
+        finally:
+            if not ok:
+                for i in empty: board.unplace(*divmod(i, board.n))
+        elapsed = time.perf_counter() - start
+        return ok, elapsed, self.nodes, self.backtracks
+
+    def _dfs(self, board, limit, ctx=None, depth=0):
+        self.nodes += 1
+        if limit and self.nodes > limit:
+            return False
+        if ctx: ctx.check(self.nodes, depth)
+        empty = board.find_empty()
+        if not empty:
+            return True
+        r,c = empty
+        for v in board.candidates(r,c):
+            board.place(r,c,v)
+            if self._dfs(board, limit, ctx, depth+1): return True
+            board.unplace(r,c)
+            self.backtracks += 1
+        return False
+
+    def count_solutions(self, board: SudokuBoard, limit=2, ctx=None):
+        # the count is capped at limit (a table hit can add a whole subtree at once)
+        if self.table and board.is_consistent(): return self._count_with_table(board, limit, ctx)
+        self._count = 0
+        nodes = [0]
+        def dfs(b, depth):
+            if self._count >= limit: return
+            nodes[0] += 1
+            if ctx: ctx.check(nodes[0], depth)
+            e = b.find_empty()
+            if not e:
+                self._count += 1; return
+            r,c = e
+            for v in b.candidates(r,c):
+                b.place(r,c,v)
+                try:
+                    dfs(b, depth+1)
+                finally:
+                    b.unplace(r,c)
+                if self._count >= limit: return
+        dfs(board, 0)
+        self.nodes = nodes[0]
+        return self._count
+
+    def iter_solutions(self, board: SudokuBoard, ctx=None, rng=None):
+        # Yields every solution as a new SudokuBoard, in the order count_solutions() finds
+        # them. The search is an explicit stack of (row, col, untried candidates) frames
+        # over a copy of the board, so it pauses at each yield, resumes on next() and ends
+        # on close(). rng: optional random.Random that shuffles each cell's candidates, so the
+        # first solutions of a huge space are spread over it rather than sharing a prefix.
+        self.nodes = 0; self.backtracks = 0
+        if not board.is_consistent(): return
+        b = board.copy()
+        stack = []
+        while True:
+            self.nodes += 1
+            if ctx: ctx.check(self.nodes, len(stack))
+            e = b.find_empty()
+            if e:
+                vals = list(b.candidates(*e))
+                if rng: rng.shuffle(vals)
+                stack.append((e[0], e[1], iter(vals)))
+            else:
+                yield b.copy()
+            # place the next untried candidate, unwinding exhausted cells
+            while stack:
+                r, c, untried = stack[-1]
+                b.unplace(r,c)
+                v = next(untried, 0)
+                if v:
+                    b.place(r,c,v); break
+                stack.pop(); self.backtracks += 1
+            else:
+                return
+
+    def _count_with_table(self, board, limit, ctx):
+        # Same search, keyed by the state's Zobrist hash. A subtree's count is stored only
+        # when the loop over its candidates finished below the limit, so every entry is exact.
+        table = self.table
+        fill = zobrist(board.g)[1]; s = board.n + 1
+        self._count = 0
+        nodes = [0]
+        def dfs(b, depth, key):
+            nodes[0] += 1
+            if ctx: ctx.check(nodes[0], depth)
+            hit = table.probe(key)
+            if hit is not None:
+                self._count += hit; return
+            e = b.find_empty()
+            if not e:
+                self._count += 1; return
+            before, start = self._count, nodes[0]
+            r,c = e
+            base = (r*b.n + c)*s
+            for v in b.candidates(r,c):
+                b.place(r,c,v)
+                try:
+                    dfs(b, depth+1, key ^ fill[base+v])
+                finally:
+                    b.unplace(r,c)
+                if self._count >= limit: return
+            table.store(key, self._count - before, nodes[0] - start)
+        dfs(board, 0, board_key(board))
+        self.nodes = nodes[0]
+        return min(self._count, limit)
@@ -0,0 +1,229 @@
+"""Board model: per-size geometry tables and SudokuBoard."""
+
+# -----------------------------
+# Sudoku data model
+# -----------------------------
+# bit (d-1) of a "used digits" mask stands for digit d
+BIT = [0] + [1 << (d-1) for d in range(1,10)]
+FULL_MASK = 0x1FF
+MASK_DIGITS = [tuple(d for d in range(1,10) if m & BIT[d]) for m in range(FULL_MASK+1)]
+POPCOUNT = [len(ds) for ds in MASK_DIGITS]
+BOX_OF = [(r//3)*3 + c//3 for r in range(9) for c in range(9)]
+
+# Larger boards use box size 4 (16x16) or 5 (25x25): digits run 1..n and are written
+# 1-9 then A, B, ...; 0 or . is an empty cell. Their masks are n bits wide, too wide for
+# flat lookup tables, so they are looked up in 9-bit chunks.
+SYMBOLS = "123456789ABCDEFGHIJKLMNOP"
+
+class _WideDigits:
+    # mask -> tuple of digits, for masks of up to 27 bits
+    __slots__ = ('tables',)
+    def __init__(self):
+        self.tables = [tuple(tuple(d + 9*k for d in ds) for ds in MASK_DIGITS) for k in range(3)]
+
+    def __getitem__(self, m):
+        t0, t1, t2 = self.tables
+        return t0[m & 511] + t1[(m >> 9) & 511] + t2[m >> 18]
+
+class _WidePopcount:
+    __slots__ = ()
+    def __getitem__(self, m):
+        return POPCOUNT[m & 511] + POPCOUNT[(m >> 9) & 511] + POPCOUNT[m >> 18]
+
+def _bits(m):
+    # the single-bit masks set in m, lowest first
+    while m:
+        b = m & -m; yield b; m ^= b
+
+def _peers_of(r, c, box=3):
+    n = box*box
+    neigh=[]
+    for i in range(n):
+        if i!=c: neigh.append((r,i))
+        if i!=r: neigh.append((i,c))
+    br,bc=(r//box)*box,(c//box)*box
+    for i in range(br,br+box):
+        for j in range(bc,bc+box):
+            if (i,j)!=(r,c) and (i,j) not in neigh: neigh.append((i,j))
+    return tuple(neigh)
+
+class Geometry:
+    # Masks, units and peer/arc index for one board size; get them through geometry(box).
+    # Units are numbered rows 0..n-1, columns n..2n-1, boxes 2n..3n-1.
+    def __init__(self, box):
+        if not 2 <= box <= 5:
+            raise ValueError("Box size must be 2-5 (4x4 up to 25x25 boards)")
+        n = box*box
+        self.box, self.n, self.ncells = box, n, n*n
+        self.symbols = SYMBOLS[:n]
+        self.chars = '0' + self.symbols                        # value -> character
+        self.value = {ch: v for v,ch in enumerate(self.symbols, 1)}
+        self.bit = [0] + [1 << (d-1) for d in range(1,n+1)]
+        self.full = (1 << n) - 1
+        if n <= 9: self.mask_digits, self.popcount = MASK_DIGITS, POPCOUNT
+        else: self.mask_digits, self.popcount = _WideDigits(), _WidePopcount()
+        self.box_of = [(r//box)*box + c//box for r in range(n) for c in range(n)]
+        self.cells = tuple((r,c) for r in range(n) for c in range(n))
+        self.unit_list = (tuple(tuple(r*n+c for c in range(n)) for r in range(n))
+                          + tuple(tuple(r*n+c for r in range(n)) for c in range(n))
+                          + tuple(tuple(r*n+c for r in range(br,br+box) for c in range(bc,bc+box))
+                                  for br in range(0,n,box) for bc in range(0,n,box)))
+        self.units = tuple((r, n+c, 2*n+self.box_of[r*n+c]) for r,c in self.cells)
+        self.peers_rc = {(r,c): _peers_of(r,c,box) for r,c in self.cells}
+        self.peers = tuple(tuple(r*n+c for r,c in self.peers_rc[v]) for v in self.cells)
+        self.arcs = tuple((i,j) for i in range(n*n) for j in self.peers[i])
+        # per cell: offsets of its row, column, box, row-in-box and column-in-box segment
+        # counters in CSPSolver.vcount (n+1 slots each, indexed by digit)
+        self.lcv_bases = tuple(tuple(k*(n+1) for k in (r, n+c, 2*n+self.box_of[r*n+c],
+                                                       3*n + r*box + c//box, 3*n + n*box + c*box + r//box))
+                               for r,c in self.cells)
+
+_GEOMETRIES = {}
+
+def geometry(box=3):
+    g = _GEOMETRIES.get(box)
+    if g is None: g = _GEOMETRIES[box] = Geometry(box)
+    return g
+
+def _box_for(n):
+    box = int(round(n ** 0.5))
+    if box*box != n: raise ValueError(f"Board side {n} is not a square (9, 16, 25)")
+    return box
+
+class _Row(list):
+    # one row of SudokuBoard.grid; writes are routed through the board so the masks stay in sync
+    __slots__ = ('_board', '_r')
+
+    def __setitem__(self, c, v):
+        n = self._board.n
+        if isinstance(c, slice):
+            for cc, vv in zip(range(n)[c], v): self._board.place(self._r, cc, vv)
+        else:
+            self._board.place(self._r, c + n if c < 0 else c, v)
+
+class SudokuBoard:
+    # flat n*n cell array plus per-row/column/box masks of the digits in use (n = box*box,
+    # 9 unless the grid or box says otherwise). `grid` stays available as n row lists;
+    # assigning grid[r][c] is the same as place(). Occurrence counts per unit keep the masks
+    # exact even when a typed-in board has duplicates.
+    def __init__(self, grid=None, box=None):
+        if box is None: box = _box_for(len(grid)) if grid else 3
+        self.g = g = geometry(box)
+        self.n = n = g.n
+        self.cells = [0]*g.ncells
+        self.rows = [0]*n; self.cols = [0]*n; self.boxes = [0]*n
+        self._cnt = [0]*(3*n*(n+1))  # (unit*(n+1) + digit) -> occurrences, units numbered as in Geometry
+        self._dups = 0
+        self._empty = [g.full]*n     # per row: bit c set while (r,c) is empty
+        self._make_rows()
+        if grid:
+            for r,row in enumerate(grid):
+                for c,v in enumerate(row):
+                    if v: self.place(r, c, v)
+
+    def _make_rows(self):
+        n = self.n
+        self.grid = []
+        for r in range(n):
+            row = _Row(self.cells[r*n:r*n+n]); row._board = self; row._r = r
+            self.grid.append(row)
+
+    def __reduce__(self):
+        return (SudokuBoard, ([list(row) for row in self.grid],))
+
+    @staticmethod
+    def from_string(s, box=None):
+        # digits 1-9 then letters for boards above 9x9, 0 or . for blanks; other characters
+        # are ignored. Without `box` the size is taken from the cell count when it is exactly
+        # 16, 256 or 625, and is 9x9 otherwise.
+        if box is None:
+            size = sum(1 for ch in s if ch.isalnum() or ch == '.')
+            box = {16: 2, 256: 4, 625: 5}.get(size, 3)
+        g = geometry(box)
+        s = ''.join(ch for ch in s.upper() if ch in g.value or ch in '.0')
+        if len(s) < g.ncells:
+            raise ValueError(f"Puzzle must contain at least {g.ncells} characters "
+                             f"({g.symbols[0]}-{g.symbols[-1]}/0/.)")
+        b = SudokuBoard(box=box)
+        for i,ch in enumerate(s[:g.ncells]):
+            if ch not in '.0':
+                r,c = divmod(i,g.n)
+                b.place(r, c, g.value[ch])
+        return b
+
+    def to_string(self):
+        chars = self.g.chars
+        return ''.join([chars[v] for v in self.cells])
+
+    def copy(self):
+        b = SudokuBoard.__new__(SudokuBoard)
+        b.g = self.g; b.n = self.n
+        b.cells = self.cells[:]
+        b.rows = self.rows[:]; b.cols = self.cols[:]; b.boxes = self.boxes[:]
+        b._cnt = self._cnt[:]; b._dups = self._dups; b._empty = self._empty[:]
+        b._make_rows()
+        return b
+
+    def place(self, r, c, v):
+        n = self.n; i = r*n+c
+        if self.cells[i]: self.unplace(r, c)
+        if v:
+            g = self.g; bx = g.box_of[i]; bit = g.bit[v]; cnt = self._cnt; s = n+1
+            for k in (r*s+v, (n+c)*s+v, (2*n+bx)*s+v):
+                cnt[k] += 1
+                if cnt[k] > 1: self._dups += 1
+            self.rows[r] |= bit; self.cols[c] |= bit; self.boxes[bx] |= bit
+            self._empty[r] &= ~(1 << c)
+            self.cells[i] = v
+            list.__setitem__(self.grid[r], c, v)
+
+    def unplace(self, r, c):
+        n = self.n; i = r*n+c
+        v = self.cells[i]
+        if not v: return
+        g = self.g; bx = g.box_of[i]; bit = g.bit[v]; cnt = self._cnt; s = n+1
+        for k, masks, u in ((r*s+v, self.rows, r), ((n+c)*s+v, self.cols, c), ((2*n+bx)*s+v, self.boxes, bx)):
+            cnt[k] -= 1
+            if cnt[k]: self._dups -= 1
+            else: masks[u] &= ~bit
+        self._empty[r] |= 1 << c
+        self.cells[i] = 0
+        list.__setitem__(self.grid[r], c, 0)
+
+    def candidates(self, r, c):
+        # digits not yet used in the row, column or box of (r,c)
+        g = self.g
+        return g.mask_digits[~(self.rows[r] | self.cols[c] | self.boxes[g.box_of[r*self.n+c]]) & g.full]
+
+    def find_empty(self):
+        for r in range(self.n):
+            m = self._empty[r]
+            if m: return (r, (m & -m).bit_length()-1)
+        return None
+
+    def is_valid_move(self, r, c, val):
+        if val == 0: return True
+        n = self.n; i = r*n+c; bx = self.g.box_of[i]
+        cur = self.cells[i]
+        if cur == 0:
+            return not (self.rows[r] | self.cols[c] | self.boxes[bx]) & self.g.bit[val]
+        # the cell itself does not count against its own value
+        own = 1 if cur == val else 0; cnt = self._cnt; s = n+1
+        return cnt[r*s+val] == own and cnt[(n+c)*s+val] == own and cnt[(2*n+bx)*s+val] == own
+
+    def is_consistent(self):
+        # no duplicates among filled cells
+        return self._dups == 0
+
+# -----------------------------
+# Static peer / unit index (built once at import)
+# -----------------------------
+# the 9x9 tables under their own names, used directly by the 9x9-only code below
+_G9 = geometry(3)
+CELLS = _G9.cells
+UNIT_LIST = _G9.unit_list
+UNITS = _G9.units                # cell -> its row, column and box unit
+PEERS_RC = _G9.peers_rc          # (r,c) -> 20 peers
+PEERS = _G9.peers                # index -> 20 peer indices
+ARCS_RC = tuple((xi,xj) for xi in CELLS for xj in PEERS_RC[xi])
+ARCS = _G9.arcs
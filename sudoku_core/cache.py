@@ -0,0 +1,134 @@
+"""Solution cache keyed on canonical forms."""
+
+import time, threading, itertools
+from collections import OrderedDict, deque
+
+from .board import SudokuBoard
+from .csp import CSPSolver
+
+# -----------------------------
+# Solution cache keyed on canonical forms
+# -----------------------------
+def _tied_orders(items, key):
+    # every ordering of `items` sorted by key, permuting only inside runs of equal keys
+    orders = [()]
+    for _, grp in itertools.groupby(sorted(items, key=key), key):
+        grp = tuple(grp)
+        orders = [o + p for o in orders for p in itertools.permutations(grp)]
+    return orders
+
+def _line_orders(keys):
+    # row (or column) orders allowed by the band/stack structure, ranked by per-line invariants
+    band_key = lambda b: tuple(sorted(keys[3*b:3*b+3]))
+    out = []
+    for bands in _tied_orders(range(3), band_key):
+        inner = [()]
+        for b in bands:
+            inner = [o + p for o in inner for p in _tied_orders(range(3*b, 3*b+3), keys.__getitem__)]
+        out.extend(inner)
+    return out
+
+def canonical_form(cells, max_orders=64):
+    # Maps a puzzle (81 digits) to a representative of its class under digit relabelling,
+    # band/stack and row/column-within-band permutations and transposition. Returns
+    # (canonical string, perm, label) where canonical cell k is original cell perm[k] with
+    # digit d written as label[d]. Rows and columns are ranked by invariants of the clue
+    # pattern and the lexicographically smallest relabelled string over tied orders wins;
+    # if the ties allow more than max_orders combinations the first order is used alone,
+    # which still gives a valid (if less shareable) key.
+    best = None
+    for t in (False, True):
+        g = [cells[(i%9)*9 + i//9] for i in range(81)] if t else list(cells)
+        rowcnt = [sum(1 for c in range(9) if g[r*9+c]) for r in range(9)]
+        colcnt = [sum(1 for r in range(9) if g[r*9+c]) for c in range(9)]
+        rkey = [(rowcnt[r], tuple(sorted(colcnt[c] for c in range(9) if g[r*9+c]))) for r in range(9)]
+        ckey = [(colcnt[c], tuple(sorted(rowcnt[r] for r in range(9) if g[r*9+c]))) for c in range(9)]
+        row_orders = _line_orders(rkey); col_orders = _line_orders(ckey)
+        if len(row_orders)*len(col_orders) > max_orders:
+            row_orders = row_orders[:1]; col_orders = col_orders[:1]
+        for R in row_orders:
+            for C in col_orders:
+                label = {}; out = []
+                for r in R:
+                    for c in C:
+                        v = g[r*9+c]
+                        out.append(str(label.setdefault(v, len(label)+1)) if v else '0')
+                key = ''.join(out)
+                if best is None or key < best[0]: best = (key, t, R, C, label)
+    key, t, R, C, label = best
+    perm = [C[k%9]*9 + R[k//9] if t else R[k//9]*9 + C[k%9] for k in range(81)]
+    lab = [0]*10
+    for d,l in label.items(): lab[d] = l
+    free = iter(range(len(label)+1, 10))
+    for d in range(1,10):
+        if not lab[d]: lab[d] = next(free)
+    return key, perm, lab
+
+class SolutionCache:
+    # LRU cache of solved puzzles keyed by canonical_form(), so repeated and isomorphic
+    # boards are answered by mapping a stored solution back through the transform. A miss
+    # also tries the most recent solutions as-is: one that agrees with every filled cell
+    # is a solution of this board too (the usual case after the user types a digit).
+    def __init__(self, capacity=256, recent=16, max_orders=64):
+        self.capacity = capacity
+        self.max_orders = max_orders
+        self.entries = OrderedDict()          # canonical puzzle -> canonical solution string or None
+        self.recent = deque(maxlen=recent)    # solution strings in board orientation
+        self.hits = 0; self.superset_hits = 0; self.misses = 0
+        self.lock = threading.Lock()          # the UI solves on worker threads
+
+    def stats(self):
+        return {"hits": self.hits, "superset_hits": self.superset_hits, "misses": self.misses,
+                "size": len(self.entries)}
+
+    def get(self, board: SudokuBoard):
+        # returns (found, solution board or None); only 9x9 boards are cached
+        if board.n != 9: return False, None
+        key, perm, lab = canonical_form(board.cells, self.max_orders)
+        with self.lock:
+            return self._lookup(board, key, perm, lab)
+
+    def _lookup(self, board, key, perm, lab):
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            sol = self.entries[key]
+            if sol is None: return True, None
+            inv = [0]*10
+            for d in range(1,10): inv[lab[d]] = d
+            cells = [0]*81
+            for k in range(81): cells[perm[k]] = inv[int(sol[k])]
+            out = SudokuBoard([cells[r*9:r*9+9] for r in range(9)])
+            self.recent.append(out.to_string())
+            return True, out
+        given = [(i,v) for i,v in enumerate(board.cells) if v]
+        for sol in self.recent:
+            if all(int(sol[i]) == v for i,v in given):
+                self.superset_hits += 1
+                return True, SudokuBoard.from_string(sol)
+        self.misses += 1
+        return False, None
+
+    def put(self, board: SudokuBoard, solution):
+        if board.n != 9: return
+        key, perm, lab = canonical_form(board.cells, self.max_orders)
+        if solution is not None:
+            sol = solution.to_string()
+            solution = ''.join(str(lab[int(sol[perm[k]])]) for k in range(81))
+        with self.lock:
+            if solution is not None: self.recent.append(sol)
+            self.entries[key] = solution
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+
+    def solve(self, board: SudokuBoard, solver=None, ctx=None):
+        # same tuple as CSPSolver.solve; hits report the lookup time and 0 nodes
+        start = time.perf_counter()
+        found, sol = self.get(board)
+        if found: return sol, time.perf_counter() - start, 0, 0
+        res = (solver or CSPSolver()).solve(board, ctx=ctx)
+        # only solutions are stored: a None may come from a solver that was interrupted or
+        # misused, and caching it would report the board unsolvable for good
+        if res[0] is not None: self.put(board, res[0])
+        return res
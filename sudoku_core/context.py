@@ -0,0 +1,41 @@
+"""Run context shared by the solvers: cancellation, deadlines and progress."""
+
+import time
+
+# -----------------------------
+# Solver run context (cancellation, deadlines, progress)
+# -----------------------------
+class SolverCancelled(Exception):
+    pass
+
+class SolverTimeout(SolverCancelled):
+    pass
+
+class RunContext:
+    # Passed to a solver run by whoever started it. cancel() may be called from any thread.
+    # Solvers call check(nodes, depth) once per node; the flag, clock and progress callback
+    # are only looked at every `check_every` nodes, so the hot loop pays one decrement.
+    # progress(nodes, nodes_per_sec, depth) is called at most once per `interval` seconds.
+    def __init__(self, timeout=None, deadline=None, progress=None, interval=0.25, check_every=256):
+        self.deadline = deadline if deadline is not None else (time.time() + timeout if timeout else None)
+        self.progress = progress
+        self.interval = interval
+        self.check_every = check_every
+        self.cancelled = False
+        self._countdown = check_every
+        self._last_t = time.time(); self._last_nodes = 0
+
+    def cancel(self):
+        self.cancelled = True
+
+    def check(self, nodes, depth=0):
+        self._countdown -= 1
+        if self._countdown > 0: return
+        self._countdown = self.check_every
+        if self.cancelled: raise SolverCancelled("cancelled")
+        now = time.time()
+        if self.deadline is not None and now >= self.deadline: raise SolverTimeout("deadline exceeded")
+        if self.progress and now - self._last_t >= self.interval:
+            rate = (nodes - self._last_nodes) / (now - self._last_t)
+            self._last_t = now; self._last_nodes = nodes
+            self.progress(nodes, rate, depth)
@@ -0,0 +1,351 @@
+"""CSP solver: AC-3 or GAC propagation with MRV / LCV search."""
+
+import time
+from collections import deque
+
+from .board import SudokuBoard, _bits
+from .transposition import zobrist
+
+# -----------------------------
+# CSP solver (AC-3 + MRV + LCV)
+# -----------------------------
+class SearchStats:
+    # What an instrumented CSPSolver run did. Counters cover the whole run; `initial` holds
+    # them as they stood after the initial AC-3 (or GAC) pass, and `phases` the seconds spent
+    # in that pass, the search and building the solution board.
+    COUNTERS = ("arcs_enqueued", "revise_calls", "units_revised", "values_pruned",
+                "assignments", "max_depth")
+
+    def __init__(self):
+        for k in self.COUNTERS: setattr(self, k, 0)
+        self.initial = {}
+        self.phases = {"initial_ac3": 0.0, "search": 0.0, "reconstruction": 0.0}
+
+    def counters(self):
+        return {k: getattr(self, k) for k in self.COUNTERS}
+
+    def as_dict(self):
+        return dict(self.counters(), initial=dict(self.initial), phases=dict(self.phases))
+
+class CSPSolver:
+    # preprocess: optional LogicSolver whose deductions are filled in before AC-3 and search.
+    # propagation: 'ac3' revises the binary != arcs between peers; 'gac' treats every row,
+    # column and box as one all-different constraint (see gac()), which also makes the
+    # pigeonhole deductions AC-3 cannot see.
+    # instrument: collect a SearchStats in self.stats for each solve(). tracer: optional
+    # tracer(event, cell, value, depth) called on 'assign', 'prune' and 'backtrack' (implies
+    # instrument). Both swap in counting versions of the AC-3 methods, so a solver created
+    # without them runs the plain code.
+    # table: optional TranspositionTable of nogoods. A search node is keyed by its singleton
+    # cells (see transposition.py); a failed subtree is stored as a 0 count, and a node whose
+    # key is known to fail is cut off, so repeated solves of the same or an edited puzzle
+    # (hints, re-solves while editing) skip the dead ends already proved.
+    PROPAGATION = ('ac3', 'gac')
+
+    def __init__(self, preprocess=None, instrument=False, tracer=None, propagation='ac3', table=None):
+        if propagation not in self.PROPAGATION:
+            raise ValueError(f"Unknown propagation {propagation!r}; choose from {', '.join(self.PROPAGATION)}")
+        self.nodes = 0
+        self.backtracks = 0
+        self.preprocess = preprocess
+        self.use_gac = propagation == 'gac'
+        self.tracer = tracer
+        self.table = table
+        self.stats = None
+        if instrument or tracer:
+            self.stats = SearchStats()
+            self.ac3 = self._ac3_counted
+            self.revise = self._revise_counted
+
+    # The search state below lives on the instance, so one CSPSolver runs one solve at a
+    # time; callers that solve concurrently (GUI worker threads) create a solver per run.
+    # Domains are one flat list of n*n candidate bitmasks. Every pruning is logged on
+    # self.trail as (cell, old mask) and rolled back with undo() when a branch fails.
+    # All domain changes go through _set(), which keeps the MRV buckets (cells by domain
+    # size), the unassigned-peer degrees and the per-unit digit counts used for LCV in step.
+    def solve(self, board: SudokuBoard, ctx=None):
+        if self.preprocess:
+            board = board.copy()
+            if self.preprocess.propagate(board) is None: return None, 0, 0, 0
+        self.g = g = board.g
+        domains = [g.full if v==0 else g.bit[v] for v in board.cells]
+        self.trail = []
+        self.ctx = ctx
+        stats = self.stats
+        if stats: stats.__init__(); self.depth = 0
+        t0 = time.perf_counter()
+        self._init_heuristics(domains)
+        if self.use_gac:
+            self.matches = [[0]*g.n for _ in range(3*g.n)]
+            ok = self.gac(domains)
+        else:
+            ok = self.ac3(domains)
+        start = time.perf_counter()
+        if stats:
+            stats.phases["initial_ac3"] = start - t0
+            stats.initial = stats.counters()
+        if not ok:
+            return None, 0, 0, 0
+        self.nodes = 0; self.backtracks = 0
+        if self.table:
+            self.fill = zobrist(g)[1]
+            self.key = self._child_key(domains, 0, zobrist(g)[0], [(i, g.full) for i in range(g.ncells)])
+        res = self._backtrack(domains)
+        elapsed = time.perf_counter() - start
+        out = None
+        if res:
+            n = g.n
+            out = SudokuBoard([res[r*n:r*n+n] for r in range(n)])
+        if stats:
+            stats.phases["search"] = elapsed
+            stats.phases["reconstruction"] = time.perf_counter() - start - elapsed
+        return out, elapsed, self.nodes, self.backtracks
+
+    def neighbors(self, var):
+        return self.g.peers[var]
+
+    def ac3(self, domains, arcs=None):
+        q = deque(self.g.arcs if arcs is None else arcs)
+        peers = self.g.peers
+        while q:
+            xi,xj = q.popleft()
+            if self.revise(domains, xi, xj):
+                if not domains[xi]: return False
+                for xk in peers[xi]:
+                    if xk!=xj: q.append((xk, xi))
+        return True
+
+    def revise(self, domains, xi, xj):
+        # under !=, a value of xi loses its last support only when xj is down to that value
+        dj = domains[xj]
+        old = domains[xi]
+        if dj & (dj-1) or not old & dj: return False
+        self.trail.append((xi, old))
+        # inlined _set() for the common case of dropping exactly one digit
+        g = self.g
+        domains[xi] = old & ~dj
+        size = g.popcount[old]
+        self.buckets[size].discard(xi); self.buckets[size-1].add(xi)
+        if size == 2:
+            degree = self.degree
+            for p in g.peers[xi]: degree[p] -= 1
+        v = dj.bit_length(); vcount = self.vcount
+        r, c, b, mr, mc = g.lcv_bases[xi]
+        vcount[r+v] -= 1; vcount[c+v] -= 1; vcount[b+v] -= 1; vcount[mr+v] -= 1; vcount[mc+v] -= 1
+        return True
+
+    def _ac3_counted(self, domains, arcs=None):
+        q = deque(self.g.arcs if arcs is None else arcs)
+        peers = self.g.peers; stats = self.stats
+        stats.arcs_enqueued += len(q)
+        while q:
+            xi,xj = q.popleft()
+            if self.revise(domains, xi, xj):
+                if not domains[xi]: return False
+                for xk in peers[xi]:
+                    if xk!=xj: q.append((xk, xi))
+                stats.arcs_enqueued += len(peers[xi]) - 1
+        return True
+
+    def _revise_counted(self, domains, xi, xj):
+        self.stats.revise_calls += 1
+        if not CSPSolver.revise(self, domains, xi, xj): return False
+        self.stats.values_pruned += 1
+        if self.tracer: self.tracer('prune', xi, domains[xj].bit_length(), self.depth)
+        return True
+
+    def gac(self, domains, units=None):
+        # Generalised arc consistency for the all-different constraints (Regin). Each unit in
+        # the work queue is filtered by _gac_unit(); when that narrows a cell, the cell's
+        # other units are queued again. A unit is in the queue at most once at a time.
+        g = self.g
+        q = deque(range(3*g.n) if units is None else units)
+        queued = [False]*(3*g.n)
+        for u in q: queued[u] = True
+        cell_units = g.units
+        while q:
+            u = q.popleft(); queued[u] = False
+            changed = self._gac_unit(domains, u)
+            if changed is None: return False
+            for i in changed:
+                for w in cell_units[i]:
+                    if not queued[w] and w != u:
+                        queued[w] = True; q.append(w)
+        return True
+
+    def _gac_unit(self, domains, u):
+        # Matches the unit's cells to distinct digits (kept from the last call as a warm
+        # start). As a unit has as many digits as cells the matching is perfect, so a digit
+        # d in cell x survives iff d is x's own match or the cell matched to d lies in x's
+        # strongly connected component of "x -> y when x could take y's digit".
+        # Returns the cells that were narrowed, or None if the unit cannot be satisfied.
+        cells = self.g.unit_list[u]; n = len(cells)
+        dom = [domains[i] for i in cells]
+        match = self.matches[u]
+        owner = {}
+        for k in range(n):
+            b = match[k]
+            if b & dom[k] and b not in owner: owner[b] = k
+            else: match[k] = 0
+        for k in range(n):
+            if not match[k] and not self._augment(k, dom, match, owner, [0]): return None
+        free = [dom[k] & ~match[k] for k in range(n)]
+        if not any(free): return []
+        comp = self._components([[owner[b] for b in _bits(free[k])] for k in range(n)])
+        allowed = {}
+        for k in range(n): allowed[comp[k]] = allowed.get(comp[k], 0) | match[k]
+        changed = []
+        stats = self.stats
+        if stats: stats.units_revised += 1
+        for k in range(n):
+            new = dom[k] & allowed[comp[k]]
+            if new != dom[k]:
+                i = cells[k]
+                self.trail.append((i, dom[k])); self._set(domains, i, new)
+                changed.append(i)
+                if stats:
+                    stats.values_pruned += self.g.popcount[dom[k] & ~new]
+                    if self.tracer:
+                        for v in self.g.mask_digits[dom[k] & ~new]: self.tracer('prune', i, v, self.depth)
+        return changed
+
+    def _augment(self, k, dom, match, owner, visited):
+        # Kuhn's augmenting path from position k; visited[0] is a mask of digits tried
+        m = dom[k] & ~visited[0]
+        while m:
+            b = m & -m; m ^= b
+            visited[0] |= b
+            j = owner.get(b)
+            if j is None or self._augment(j, dom, match, owner, visited):
+                match[k] = b; owner[b] = k
+                return True
+        return False
+
+    @staticmethod
+    def _components(adj):
+        # Tarjan's strongly connected components; returns a component id per node
+        n = len(adj)
+        index = [-1]*n; low = [0]*n; on = [False]*n; comp = [-1]*n
+        stack = []; counter = [0, 0]
+        def visit(v):
+            index[v] = low[v] = counter[0]; counter[0] += 1
+            stack.append(v); on[v] = True
+            for w in adj[v]:
+                if index[w] < 0:
+                    visit(w); low[v] = min(low[v], low[w])
+                elif on[w]:
+                    low[v] = min(low[v], index[w])
+            if low[v] == index[v]:
+                while True:
+                    w = stack.pop(); on[w] = False; comp[w] = counter[1]
+                    if w == v: break
+                counter[1] += 1
+        for v in range(n):
+            if index[v] < 0: visit(v)
+        return comp
+
+    def _init_heuristics(self, domains):
+        g = self.g; pc = g.popcount
+        self.buckets = [set() for _ in range(g.n+1)]
+        for i,d in enumerate(domains): self.buckets[pc[d]].add(i)
+        self.degree = [sum(1 for p in g.peers[i] if pc[domains[p]]>1) for i in range(g.ncells)]
+        # (counter base + digit) -> cells of that unit/segment with digit in domain
+        self.vcount = [0]*((3*g.n + 2*g.n*g.box)*(g.n+1))
+        for i,d in enumerate(domains):
+            for k in g.lcv_bases[i]:
+                for v in g.mask_digits[d]: self.vcount[k+v] += 1
+
+    def _set(self, domains, i, new):
+        g = self.g
+        old = domains[i]; domains[i] = new
+        so, sn = g.popcount[old], g.popcount[new]
+        if so != sn:
+            self.buckets[so].discard(i); self.buckets[sn].add(i)
+            if (so > 1) != (sn > 1):
+                step = 1 if sn > 1 else -1
+                degree = self.degree
+                for p in g.peers[i]: degree[p] += step
+        diff = old ^ new
+        if diff:
+            # a change either only removes (pruning) or only restores (undo) digits
+            step = 1 if new & diff else -1
+            vcount = self.vcount
+            r, c, b, mr, mc = g.lcv_bases[i]
+            for v in g.mask_digits[diff]:
+                vcount[r+v] += step; vcount[c+v] += step; vcount[b+v] += step
+                vcount[mr+v] += step; vcount[mc+v] += step
+
+    def undo(self, domains, mark):
+        trail = self.trail
+        while len(trail) > mark:
+            i,d = trail.pop(); self._set(domains, i, d)
+
+    def select_unassigned(self, domains):
+        # smallest non-empty bucket, ties broken by degree and then by cell order
+        for size in range(2, self.g.n+1):
+            cands = self.buckets[size]
+            if cands: break
+        else:
+            return None
+        if len(cands)==1: return next(iter(cands))
+        degree = self.degree
+        return max(cands, key=lambda v: (degree[v], -v))
+
+    def order_values(self,var,domains):
+        # peers sharing val = row + column + box - the two in-box segments (which the box
+        # and the line both count) - var itself
+        r, c, b, mr, mc = self.g.lcv_bases[var]
+        vc = self.vcount
+        costs = [(vc[r+val] + vc[c+val] + vc[b+val] - vc[mr+val] - vc[mc+val] - 1, val)
+                 for val in self.g.mask_digits[domains[var]]]
+        costs.sort()
+        return [v for _,v in costs]
+
+    def consistent_with_neighbors(self,var,val,domains):
+        bit = self.g.bit[val]
+        for n in self.g.peers[var]:
+            if domains[n]==bit: return False
+        return True
+
+    def _backtrack(self, domains, depth=0):
+        self.nodes += 1
+        if self.ctx: self.ctx.check(self.nodes, depth)
+        stats = self.stats
+        if stats and depth > stats.max_depth: stats.max_depth = depth
+        var = self.select_unassigned(domains)
+        if var is None: return [d.bit_length() for d in domains]
+        table = self.table
+        if table:
+            if table.probe(self.key) == 0: return None
+            key = self.key; start = self.nodes
+        for val in self.order_values(var, domains):
+            if self.consistent_with_neighbors(var,val,domains):
+                mark = len(self.trail)
+                self.trail.append((var, domains[var])); self._set(domains, var, self.g.bit[val])
+                if stats:
+                    stats.assignments += 1; self.depth = depth
+                    if self.tracer: self.tracer('assign', var, val, depth)
+                # domains were consistent before the assignment, so only var's arcs / units need revisiting
+                if (self.gac(domains, self.g.units[var]) if self.use_gac
+                        else self.ac3(domains, [(xk, var) for xk in self.g.peers[var]])):
+                    if table: self.key = self._child_key(domains, mark, key)
+                    res = self._backtrack(domains, depth+1)
+                    if res: return res
+                self.undo(domains, mark)
+                self.backtracks += 1
+                if self.tracer: self.tracer('backtrack', var, val, depth)
+        if table:
+            self.key = key
+            table.store(key, 0, self.nodes - start)
+        return None
+
+    def _child_key(self, domains, mark, key, changes=None):
+        # key after the cells changed since trail[mark] that became singletons are filled in;
+        # the first trail entry of a cell holds its domain from before the step
+        pc = self.g.popcount; fill = self.fill; s = self.g.n + 1
+        seen = set()
+        for i, old in (self.trail[mark:] if changes is None else changes):
+            if i in seen: continue
+            seen.add(i)
+            if pc[old] > 1 and pc[domains[i]] == 1: key ^= fill[i*s + domains[i].bit_length()]
+        return key
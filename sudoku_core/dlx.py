@@ -0,0 +1,142 @@
+"""Dancing Links (Algorithm X) solver."""
+
+import time
+
+from .board import SudokuBoard
+
+# -----------------------------
+# Dancing Links solver (Algorithm X over the 324-column exact cover)
+# -----------------------------
+# Columns: 1-81 cell filled, 82-162 row has digit, 163-243 column has digit,
+# 244-324 box has digit (0 is the root header). Candidate row (r,c,d) is
+# matrix row (r*9+c)*9+d-1 and owns the 4 nodes starting at 325+4*row.
+# An n x n board has the same layout with n*n columns per block.
+_DLX_TEMPLATES = {}
+
+def _dlx_template(g):
+    if g.box not in _DLX_TEMPLATES:
+        N = g.ncells; n = 4*N + 1
+        L = [i-1 for i in range(n)]; L[0] = n-1
+        R = [i+1 for i in range(n)]; R[n-1] = 0
+        U = list(range(n)); D = list(range(n)); C = list(range(n)); ROW = [-1]*n; S = [0]*n
+        for row in range(N*g.n):
+            cell, d = divmod(row, g.n); r,c = divmod(cell, g.n)
+            first = len(C)
+            for k,col in enumerate((1+cell, 1+N+r*g.n+d, 1+2*N+c*g.n+d, 1+3*N+g.box_of[cell]*g.n+d)):
+                x = len(C)
+                U.append(U[col]); D.append(col); D[U[col]] = x; U[col] = x
+                C.append(col); ROW.append(row); S[col] += 1
+                L.append(x-1 if k else first+3); R.append(x+1 if k<3 else first)
+        _DLX_TEMPLATES[g.box] = (L,R,U,D,C,ROW,S)
+    return _DLX_TEMPLATES[g.box]
+
+class DLXSolver:
+    def __init__(self):
+        self.nodes = 0
+        self.backtracks = 0
+
+    def solve(self, board: SudokuBoard, ctx=None):
+        self.nodes = 0; self.backtracks = 0
+        start = time.perf_counter()
+        count, first = self._run(board, 1, ctx)
+        elapsed = time.perf_counter() - start
+        if count:
+            n = board.n
+            return SudokuBoard([first[r*n:r*n+n] for r in range(n)]), elapsed, self.nodes, self.backtracks
+        return None, elapsed, self.nodes, self.backtracks
+
+    def count_solutions(self, board: SudokuBoard, limit=2, ctx=None):
+        self.nodes = 0; self.backtracks = 0
+        return self._run(board, limit, ctx)[0]
+
+    def iter_solutions(self, board: SudokuBoard, ctx=None):
+        # Yields every solution as a new SudokuBoard, lazily: the search pauses at each yield
+        # and resumes on next(); close() (or dropping the generator) ends it. Nothing is kept
+        # between solutions beyond the link arrays and one frame per chosen row.
+        self.nodes = 0; self.backtracks = 0
+        n = board.n
+        for sol in self._solutions(board, ctx):
+            yield SudokuBoard([sol[r*n:r*n+n] for r in range(n)])
+
+    def _run(self, board, limit, ctx=None):
+        # returns (number of solutions found up to limit, first solution as a list of cells)
+        found, first = 0, None
+        for sol in self._solutions(board, ctx):
+            found += 1
+            if first is None: first = sol
+            if found >= limit: break
+        return found, first
+
+    def _solutions(self, board, ctx=None):
+        # generator over the solutions as lists of cells; the search is an explicit loop over
+        # `frames` ([column, chosen node] per level) so it can stop at a yield and resume
+        if not board.is_consistent(): return
+        g = board.g; n = g.n
+        L,R,U,D,C,ROW,S = (a[:] for a in _dlx_template(g))
+
+        def cover(c):
+            R[L[c]] = R[c]; L[R[c]] = L[c]
+            i = D[c]
+            while i != c:
+                j = R[i]
+                while j != i:
+                    D[U[j]] = D[j]; U[D[j]] = U[j]; S[C[j]] -= 1
+                    j = R[j]
+                i = D[i]
+
+        def uncover(c):
+            i = U[c]
+            while i != c:
+                j = L[i]
+                while j != i:
+                    S[C[j]] += 1; D[U[j]] = j; U[D[j]] = j
+                    j = L[j]
+                i = U[i]
+            R[L[c]] = c; L[R[c]] = c
+
+        cells = list(board.cells)
+        for i,v in enumerate(cells):
+            if not v: continue
+            x = 4*g.ncells + 1 + 4*(i*n+v-1)
+            for j in (x, x+1, x+2, x+3):
+                col = C[j]
+                if R[L[col]] != col: return   # column already satisfied by another given
+                cover(col)
+
+        frames = []
+        while True:
+            self.nodes += 1
+            if ctx: ctx.check(self.nodes, len(frames))
+            if R[0] == 0:
+                sol = cells[:]
+                for _, i in frames:
+                    cell, d = divmod(ROW[i], n); sol[cell] = d+1
+                yield sol
+            else:
+                # column with the fewest remaining candidates
+                c = R[0]; best = S[c]; j = R[c]
+                while j and best > 1:
+                    if S[j] < best: c = j; best = S[j]
+                    j = R[j]
+                if best:
+                    cover(c)
+                    i = D[c]
+                    frames.append([c, i])
+                    j = R[i]
+                    while j != i: cover(C[j]); j = R[j]
+                    continue
+            # back up to the next untried row, uncovering finished columns on the way
+            while frames:
+                f = frames[-1]; c, i = f
+                j = L[i]
+                while j != i: uncover(C[j]); j = L[j]
+                self.backtracks += 1
+                i = D[i]
+                if i != c:
+                    f[1] = i
+                    j = R[i]
+                    while j != i: cover(C[j]); j = R[j]
+                    break
+                uncover(c); frames.pop()
+            else:
+                return
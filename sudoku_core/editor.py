@@ -0,0 +1,65 @@
+"""Editor-side board state: live conflicts and candidates, updated per edit."""
+
+from .board import SudokuBoard
+
+# -----------------------------
+# Editor model
+# -----------------------------
+class EditorModel:
+    # The board being edited, kept as a SudokuBoard so its per-unit digit counts and masks
+    # are always current. set() changes one cell and touches only that cell and its peers:
+    # a cell conflicts when its digit occurs more than once in one of its units, and a
+    # cell's candidates are the digits missing from its row, column and box masks, so an
+    # edit can change either only for the cell itself and its 20 peers (fewer than 3n).
+    # Solvers are seeded with a copy of `board`; nothing is re-read from the widgets.
+    def __init__(self, box=3):
+        self.board = SudokuBoard(box=box)
+        self.g = self.board.g
+        self.given = [False] * self.g.ncells
+        self.conflicts = set()               # cell indices
+
+    def value(self, i):
+        return self.board.cells[i]
+
+    def set(self, i, v):
+        # returns the cells whose conflict state or candidates may have changed
+        b = self.board; g = self.g
+        old = b.cells[i]
+        if old == v: return ()
+        r, c = divmod(i, g.n)
+        b.place(r, c, v)                     # place() with 0 empties the cell
+        touched = (i,) + g.peers[i]
+        for j in touched:
+            if b.cells[j] in (old, v): self._update(j)
+        return touched
+
+    def _update(self, j):
+        if self.in_conflict(j): self.conflicts.add(j)
+        else: self.conflicts.discard(j)
+
+    def in_conflict(self, i):
+        b = self.board; v = b.cells[i]
+        if not v: return False
+        s = self.g.n + 1; cnt = b._cnt
+        return any(cnt[u*s + v] > 1 for u in self.g.units[i])
+
+    def candidates(self, i):
+        # bit mask of the digits that could go in empty cell i (0 for a filled cell)
+        b = self.board; g = self.g
+        if b.cells[i]: return 0
+        r, c = divmod(i, g.n)
+        return ~(b.rows[r] | b.cols[c] | b.boxes[g.box_of[i]]) & g.full
+
+    def load(self, board: SudokuBoard, mark_given=True):
+        # replaces the whole board (one full pass); the conflicts are recomputed from scratch
+        self.board = board.copy()
+        self.g = self.board.g
+        self.given = [bool(v) and mark_given for v in self.board.cells]
+        self.conflicts = {i for i in range(self.g.ncells) if self.in_conflict(i)}
+
+    def consistent(self):
+        return not self.conflicts
+
+    def snapshot(self):
+        # a copy for a solver or generator to work on
+        return self.board.copy()
@@ -0,0 +1,34 @@
+"""Engine registry and the common solve_board() entry point."""
+
+import functools
+
+from .board import SudokuBoard
+from .backtracking import BacktrackingSolver
+from .csp import CSPSolver
+from .dlx import DLXSolver
+from .sat import SATSolver
+
+# -----------------------------
+# Engine registry
+# -----------------------------
+ENGINES = {'backtracking': BacktrackingSolver, 'csp': CSPSolver, 'dlx': DLXSolver,
+           'csp-gac': functools.partial(CSPSolver, propagation='gac'), 'sat': SATSolver}
+# engines with a lazy iter_solutions()
+ENUMERATORS = ('backtracking', 'dlx')
+
+def solve_board(board: SudokuBoard, engine='csp', ctx=None):
+    # common entry point for every engine: (solution board or None, elapsed, nodes, backtracks)
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine {engine!r}; choose from {', '.join(ENGINES)}")
+    solver = ENGINES[engine]()
+    if engine == 'backtracking':
+        b = board.copy()
+        ok, elapsed, nodes, back = solver.solve(b, ctx=ctx)
+        return (b if ok else None), elapsed, nodes, back
+    return solver.solve(board, ctx=ctx)
+
+def iter_solutions(board: SudokuBoard, engine='dlx', ctx=None):
+    # generator over every solution of board (new SudokuBoards), see DLXSolver.iter_solutions
+    if engine not in ENUMERATORS:
+        raise ValueError(f"Engine {engine!r} cannot enumerate solutions; choose from {', '.join(ENUMERATORS)}")
+    return ENGINES[engine]().iter_solutions(board, ctx=ctx)
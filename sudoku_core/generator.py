@@ -0,0 +1,183 @@
+"""Puzzle generator with incremental uniqueness checks."""
+
+import random
+
+from .board import SudokuBoard
+from .dlx import DLXSolver
+from .transposition import zobrist, board_key
+
+# -----------------------------
+# Puzzle generator
+# -----------------------------
+class UniquenessChecker:
+    # Removes cells one at a time from a known full solution while keeping the solution unique.
+    # The givens are held as row/column/box masks that are updated in place on every removal.
+    # If the puzzle was unique before cell i was cleared, any new solution must put a value
+    # other than solution[i] in cell i, so only that branch is searched.
+    # table: optional TranspositionTable. The searches after successive removals pass through
+    # many of the same states, so each state proved unfillable is stored as a nogood
+    # (count 0) under its Zobrist key, which is kept up to date as cells are filled and cleared.
+    def __init__(self, solution: SudokuBoard, ctx=None, table=None):
+        self.ctx = ctx
+        self.table = table
+        self.g = g = solution.g
+        self.fill = zobrist(g)[1]
+        self.key = board_key(solution)
+        self.solution = solution.cells[:]
+        self.cells = solution.cells[:]
+        self.rows = [g.full]*g.n; self.cols = [g.full]*g.n; self.boxes = [g.full]*g.n
+        self.empties = []
+        self.nodes = 0
+
+    def board(self):
+        n = self.g.n
+        return SudokuBoard([self.cells[r*n:r*n+n] for r in range(n)])
+
+    def try_remove(self, r, c):
+        # clears (r,c) if the puzzle stays unique; returns whether it was cleared
+        g = self.g
+        i = r*g.n+c; v = self.cells[i]
+        if not v: return True
+        bit = g.bit[v]; bx = g.box_of[i]
+        self.rows[r] &= ~bit; self.cols[c] &= ~bit; self.boxes[bx] &= ~bit
+        self.cells[i] = 0; self.empties.append(i)
+        self.key ^= self.fill[i*(g.n+1) + v]
+        if self._has_other_solution(i, bit):
+            self.rows[r] |= bit; self.cols[c] |= bit; self.boxes[bx] |= bit
+            self.cells[i] = v; self.empties.pop()
+            self.key ^= self.fill[i*(g.n+1) + v]
+            return False
+        return True
+
+    def _has_other_solution(self, i, bit):
+        g = self.g
+        r,c = divmod(i,g.n); bx = g.box_of[i]
+        m = ~(self.rows[r] | self.cols[c] | self.boxes[bx]) & g.full & ~bit
+        if not m: return False      # the cleared cell is still forced
+        rows, cols, boxes = self.rows, self.cols, self.boxes
+        others = [k for k in self.empties if k != i]
+        base = i*(g.n+1)
+        for d in g.mask_digits[m]:
+            b = g.bit[d]
+            rows[r] |= b; cols[c] |= b; boxes[bx] |= b; self.key ^= self.fill[base+d]
+            found = self._complete(others)
+            rows[r] &= ~b; cols[c] &= ~b; boxes[bx] &= ~b; self.key ^= self.fill[base+d]
+            if found: return True
+        return False
+
+    def _complete(self, empties):
+        # True if the open cells can all be filled; most-constrained cell first
+        self.nodes += 1
+        g = self.g
+        if self.ctx: self.ctx.check(self.nodes, g.ncells - len(empties))
+        if not empties: return True
+        table = self.table
+        if table and table.probe(self.key) == 0: return False
+        rows, cols, boxes = self.rows, self.cols, self.boxes
+        box_of, full, pc, side = g.box_of, g.full, g.popcount, g.n
+        best = -1; best_m = 0; best_n = side+1
+        for k,i in enumerate(empties):
+            r,c = divmod(i,side)
+            m = ~(rows[r] | cols[c] | boxes[box_of[i]]) & full
+            n = pc[m]
+            if n < best_n:
+                if n == 0: return False
+                best, best_m, best_n = k, m, n
+                if n == 1: break
+        i = empties[best]
+        rest = empties[:best] + empties[best+1:]
+        r,c = divmod(i,side); bx = box_of[i]
+        fill = self.fill; base = i*(side+1); start = self.nodes
+        for d in g.mask_digits[best_m]:
+            b = g.bit[d]
+            rows[r] |= b; cols[c] |= b; boxes[bx] |= b; self.key ^= fill[base+d]
+            found = self._complete(rest)
+            rows[r] &= ~b; cols[c] &= ~b; boxes[bx] &= ~b; self.key ^= fill[base+d]
+            if found: return True
+        if table: table.store(self.key, 0, self.nodes - start)
+        return False
+
+class Generator:
+    # box: 3 for classic 9x9 puzzles, 4 for 16x16, 5 for 25x25. table: optional
+    # TranspositionTable for the uniqueness checks; its nogoods hold for any puzzle of the
+    # same size, so one table serves every make_puzzle() call
+    def __init__(self, box=3, table=None):
+        self.box = box
+        self.table = table
+
+    def generate_full(self, ctx=None):
+        box = self.box; n = box*box
+        if box > 3: return self._shuffled_pattern()
+        while True:
+            board = SudokuBoard(box=box)
+            # the diagonal boxes share no row or column, so they can be filled freely
+            # (on 9x9 and up any such start can be completed; 4x4 may need another draw)
+            for k in range(0,n,box):
+                vals=list(range(1,n+1)); random.shuffle(vals); idx=0
+                for i in range(k,k+box):
+                    for j in range(k,k+box):
+                        board.place(i,j,vals[idx]); idx+=1
+            if self._fill(board, ctx, [0]): return board
+
+    def _shuffled_pattern(self):
+        # Random search thrashes on 16x16 and larger empty grids, so those start from the
+        # standard shifted-row solution and randomise it by the validity-preserving moves:
+        # rows within a band, bands, columns within a stack, stacks and a digit relabelling.
+        box = self.box; n = box*box
+        def lines():
+            groups = random.sample(range(box), box)
+            return [g*box + k for g in groups for k in random.sample(range(box), box)]
+        rows, cols = lines(), lines()
+        digits = random.sample(range(1,n+1), n)
+        return SudokuBoard([[digits[(box*(r%box) + r//box + c) % n] for c in cols] for r in rows])
+
+    def _fill(self, board, ctx=None, nodes=None, depth=0):
+        # randomised fill that always extends the empty cell with the fewest candidates;
+        # nodes is a one-item list counting the fill's search nodes, for ctx's progress
+        if ctx:
+            nodes[0] += 1; ctx.check(nodes[0], depth)
+        best, best_c = None, None
+        for i,v in enumerate(board.cells):
+            if v: continue
+            cands = board.candidates(*divmod(i,board.n))
+            if best is None or len(cands) < len(best_c):
+                best, best_c = i, cands
+                if len(cands) <= 1: break
+        if best is None: return True
+        r,c = divmod(best,board.n)
+        vals = list(best_c); random.shuffle(vals)
+        for v in vals:
+            board.place(r,c,v)
+            if self._fill(board, ctx, nodes, depth+1): return True
+            board.unplace(r,c)
+        return False
+
+    def make_puzzle(self, difficulty='Medium', ctx=None):
+        targets={'Easy':36,'Medium':46,'Hard':54}     # cells removed from a 9x9 board
+        n = self.box*self.box
+        if self.box <= 3: target = targets.get(difficulty,46) * n*n // 81
+        else:
+            # share of cells removed; bigger boards with 9x9 ratios take too long to prove unique
+            target = int({'Easy':0.40,'Medium':0.45,'Hard':0.50}.get(difficulty,0.45) * n*n)
+        full = self.generate_full(ctx)
+        positions=[(r,c) for r in range(n) for c in range(n)]
+        random.shuffle(positions)
+        if self.box >= 5: return self._remove_with_dlx(full, positions, target, ctx)
+        checker = UniquenessChecker(full, ctx, self.table)
+        removed=0
+        for (r,c) in positions:
+            if removed >= target: break
+            if checker.try_remove(r,c):
+                removed += 1
+        return checker.board()
+
+    def _remove_with_dlx(self, board, positions, target, ctx=None):
+        # UniquenessChecker only branches on cells and thrashes on 25x25; DLX also branches
+        # on (unit, digit) columns, which keeps the second-solution search small
+        dlx = DLXSolver(); removed = 0
+        for (r,c) in positions:
+            if removed >= target: break
+            v = board.grid[r][c]; board.unplace(r,c)
+            if dlx.count_solutions(board, ctx=ctx) == 1: removed += 1
+            else: board.place(r,c,v)
+        return board
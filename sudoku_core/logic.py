@@ -0,0 +1,189 @@
+"""Search-free logical techniques, used for hints and preprocessing (9x9)."""
+
+import itertools
+
+from .board import BIT, BOX_OF, FULL_MASK, MASK_DIGITS, PEERS, POPCOUNT, UNIT_LIST, SudokuBoard
+
+# -----------------------------
+# Logical propagation (search-free techniques)
+# -----------------------------
+ROW_UNITS, COL_UNITS, BOX_UNITS = UNIT_LIST[:9], UNIT_LIST[9:18], UNIT_LIST[18:]
+
+class LogicSolver:
+    # Human-style deductions over candidate bitmasks, run as a fixpoint. Used for instant
+    # hints (next_step) and as a preprocessing stage for the search engines (propagate).
+    TECHNIQUES = ("naked single", "hidden single", "pointing", "claiming", "naked pair",
+                  "hidden pair", "naked triple", "hidden triple", "x-wing")
+
+    def __init__(self):
+        # deductions made, per technique: a placement counts under the single that made it
+        # and every elimination under its rule
+        self.counts = {t: 0 for t in self.TECHNIQUES}
+
+    def candidates(self, vals):
+        # candidate mask per cell (placed cells keep their own bit); None if a cell has none
+        rows = [0]*9; cols = [0]*9; boxes = [0]*9
+        for i,v in enumerate(vals):
+            if v:
+                r,c = divmod(i,9); b = BIT[v]
+                rows[r] |= b; cols[c] |= b; boxes[BOX_OF[i]] |= b
+        cands = [0]*81
+        for i,v in enumerate(vals):
+            if v: cands[i] = BIT[v]; continue
+            r,c = divmod(i,9)
+            cands[i] = ~(rows[r] | cols[c] | boxes[BOX_OF[i]]) & FULL_MASK
+            if not cands[i]: return None
+        return cands
+
+    def next_step(self, board: SudokuBoard):
+        # (r, c, value, technique) for the next cell that can be proved without search, or None.
+        # technique is the most advanced rule needed on the way to the placement.
+        if board.n != 9: raise ValueError("LogicSolver works on 9x9 boards only")
+        vals = board.cells[:]
+        cands = self.candidates(vals)
+        if cands is None: return None
+        hardest = -1
+        while True:
+            found = self._single(vals, cands)
+            if found is None: return None
+            if found:
+                i, v, t = found
+                self.counts[self.TECHNIQUES[t]] += 1
+                t = max(t, hardest)
+                return i//9, i%9, v, self.TECHNIQUES[t]
+            t = self._eliminate(vals, cands)
+            if t < 0: return None
+            hardest = max(hardest, t)
+
+    def propagate(self, board: SudokuBoard):
+        # fills every cell the techniques can prove, in place; returns the number of cells
+        # filled, or None if the board turns out to be contradictory
+        if board.n != 9: raise ValueError("LogicSolver works on 9x9 boards only")
+        vals = board.cells[:]
+        cands = self.candidates(vals)
+        if cands is None: return None
+        filled = 0
+        while True:
+            found = self._single(vals, cands)
+            if found is None: return None
+            if found:
+                i, v, t = found
+                self.counts[self.TECHNIQUES[t]] += 1
+                board.place(i//9, i%9, v); filled += 1
+                continue
+            if self._eliminate(vals, cands) < 0: return filled
+
+    def _assign(self, vals, cands, i, v):
+        vals[i] = v; cands[i] = BIT[v]
+        for p in PEERS[i]:
+            if not vals[p]: cands[p] &= ~BIT[v]
+
+    def _single(self, vals, cands):
+        # places one naked or hidden single: returns (cell, value, technique index),
+        # False if there is none, None on a contradiction
+        for i in range(81):
+            if not vals[i]:
+                m = cands[i]
+                if not m: return None
+                if not m & (m-1):
+                    v = MASK_DIGITS[m][0]; self._assign(vals, cands, i, v)
+                    return i, v, 0
+        for unit in UNIT_LIST:
+            once = 0; twice = 0; placed = 0
+            for i in unit:
+                m = cands[i]
+                if vals[i]: placed |= m
+                else: twice |= once & m; once |= m
+            if (once | placed) != FULL_MASK: return None      # some digit has nowhere to go
+            only = once & ~twice & ~placed
+            if only:
+                v = MASK_DIGITS[only][0]
+                for i in unit:
+                    if not vals[i] and cands[i] & BIT[v]:
+                        self._assign(vals, cands, i, v)
+                        return i, v, 1
+        return False
+
+    def _eliminate(self, vals, cands):
+        # applies the first elimination rule that removes something; returns its technique index or -1
+        for t, rule in ((2, self._pointing), (3, self._claiming), (4, lambda v,c: self._naked(v,c,2)),
+                        (5, lambda v,c: self._hidden(v,c,2)), (6, lambda v,c: self._naked(v,c,3)),
+                        (7, lambda v,c: self._hidden(v,c,3)), (8, self._xwing)):
+            if rule(vals, cands):
+                self.counts[self.TECHNIQUES[t]] += 1
+                return t
+        return -1
+
+    def _remove(self, vals, cands, cells, mask):
+        changed = False
+        for i in cells:
+            if not vals[i] and cands[i] & mask:
+                cands[i] &= ~mask; changed = True
+        return changed
+
+    def _pointing(self, vals, cands):
+        # a digit confined to one row (column) of a box is removed from the rest of that row (column)
+        for b, box in enumerate(BOX_UNITS):
+            for d in range(1,10):
+                bit = BIT[d]
+                cells = [i for i in box if not vals[i] and cands[i] & bit]
+                if len(cells) < 2: continue
+                rs = {i//9 for i in cells}; cs = {i%9 for i in cells}
+                if len(rs) == 1 and self._remove(vals, cands, [i for i in ROW_UNITS[rs.pop()] if BOX_OF[i] != b], bit):
+                    return True
+                if len(cs) == 1 and self._remove(vals, cands, [i for i in COL_UNITS[cs.pop()] if BOX_OF[i] != b], bit):
+                    return True
+        return False
+
+    def _claiming(self, vals, cands):
+        # a digit confined to one box within a row (column) is removed from the rest of that box
+        for unit in ROW_UNITS + COL_UNITS:
+            for d in range(1,10):
+                bit = BIT[d]
+                cells = [i for i in unit if not vals[i] and cands[i] & bit]
+                if len(cells) < 2: continue
+                bs = {BOX_OF[i] for i in cells}
+                if len(bs) == 1 and self._remove(vals, cands, [i for i in BOX_UNITS[bs.pop()] if i not in unit], bit):
+                    return True
+        return False
+
+    def _naked(self, vals, cands, k):
+        # k cells of a unit whose candidates together are k digits: those digits leave the other cells
+        for unit in UNIT_LIST:
+            open_ = [i for i in unit if not vals[i] and 2 <= POPCOUNT[cands[i]] <= k]
+            for combo in itertools.combinations(open_, k):
+                m = 0
+                for i in combo: m |= cands[i]
+                if POPCOUNT[m] == k and self._remove(vals, cands, [i for i in unit if i not in combo], m):
+                    return True
+        return False
+
+    def _hidden(self, vals, cands, k):
+        # k digits that fit only in the same k cells of a unit: those cells lose every other digit
+        for unit in UNIT_LIST:
+            where = {}
+            for d in range(1,10):
+                cells = tuple(i for i in unit if not vals[i] and cands[i] & BIT[d])
+                if 2 <= len(cells) <= k: where[d] = cells
+            for digits in itertools.combinations(where, k):
+                cells = set()
+                for d in digits: cells.update(where[d])
+                if len(cells) != k: continue
+                keep = 0
+                for d in digits: keep |= BIT[d]
+                if self._remove(vals, cands, cells, FULL_MASK & ~keep): return True
+        return False
+
+    def _xwing(self, vals, cands):
+        for d in range(1,10):
+            bit = BIT[d]
+            for lines, cross in ((ROW_UNITS, COL_UNITS), (COL_UNITS, ROW_UNITS)):
+                pairs = {}
+                for li, line in enumerate(lines):
+                    pos = tuple(k for k,i in enumerate(line) if not vals[i] and cands[i] & bit)
+                    if len(pos) == 2: pairs.setdefault(pos, []).append(li)
+                for pos, ls in pairs.items():
+                    if len(ls) != 2: continue
+                    others = [i for k in pos for j,i in enumerate(cross[k]) if j not in ls]
+                    if self._remove(vals, cands, others, bit): return True
+        return False
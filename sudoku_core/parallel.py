@@ -0,0 +1,213 @@
+"""Search tree splitting over a process pool."""
+
+import os, threading, time
+
+from .board import SudokuBoard
+from .context import RunContext, SolverCancelled, SolverTimeout
+from .engines import ENGINES, solve_board
+
+# -----------------------------
+# Parallel tree search (frontier splitting over a process pool)
+# -----------------------------
+def _mrv_cell(board):
+    # (r, c, candidates) of the empty cell with the fewest candidates, or None if the board is full
+    best = None; n = board.n
+    for i, v in enumerate(board.cells):
+        if v: continue
+        r, c = divmod(i, n)
+        cands = board.candidates(r, c)
+        if best is None or len(cands) < len(best[2]):
+            best = (r, c, cands)
+            if len(cands) <= 1: break
+    return best
+
+def split_frontier(board: SudokuBoard, depth=2, min_tasks=1):
+    # Expands the search tree breadth first, branching on the most constrained empty cell,
+    # for `depth` levels and further while there are fewer than `min_tasks` open boards.
+    # Returns (open boards, boards completed on the way); dead branches are dropped.
+    if not board.is_consistent(): return [], []
+    frontier = [board]; complete = []; level = 0
+    while frontier and (level < depth or len(frontier) < min_tasks):
+        nxt = []
+        for b in frontier:
+            cell = _mrv_cell(b)
+            if cell is None:
+                complete.append(b); continue
+            r, c, cands = cell
+            for v in cands:
+                child = b.copy(); child.place(r, c, v); nxt.append(child)
+        frontier = nxt; level += 1
+    return frontier, complete
+
+class _OverBudget(SolverCancelled):
+    pass
+
+STOPPED = 'stopped'        # _subtree_task result of a task whose run was stopped
+
+class _SubtreeContext(RunContext):
+    # RunContext for one pool task: once the task has used `budget` nodes and some worker is
+    # idle (the `hungry` event), it gives up so the rest of its subtree can be shared out.
+    # It stops once the pool's current run id (`current`, shared) is no longer `run`, the id
+    # of the run the task belongs to. `base` is the node count of the task's earlier solver calls.
+    def __init__(self, budget, current, run, hungry, deadline=None):
+        RunContext.__init__(self, deadline=deadline)
+        self.budget = budget; self.current = current; self.run = run; self.hungry = hungry
+        self.base = 0; self.nodes = 0
+
+    def check(self, nodes, depth=0):
+        self._countdown -= 1
+        if self._countdown > 0: return
+        self._countdown = self.check_every
+        self.nodes = nodes
+        if self.base + nodes >= self.budget and self.hungry.is_set(): raise _OverBudget("budget")
+        if self.current is not None and self.current.value != self.run: raise SolverCancelled("stopped")
+        if self.deadline is not None and time.time() >= self.deadline: raise SolverTimeout("deadline exceeded")
+
+_SPLIT_RUN = _SPLIT_HUNGRY = None
+
+def _init_split_worker(current, hungry):
+    global _SPLIT_RUN, _SPLIT_HUNGRY
+    _SPLIT_RUN, _SPLIT_HUNGRY = current, hungry
+
+def _subtree_task(kind, engine, puzzle, box, limit, budget, deadline, run):
+    # One pool task, in a worker process: the children of `puzzle` are searched in turn and,
+    # if the budget runs out, the ones not finished are handed back to be queued again.
+    # Returns (found, rest, nodes, backtracks): found is a solution count for kind 'count',
+    # a solution string or None for 'solve'; rest is the list of unfinished children.
+    # A task stopped because its run ended returns found = STOPPED, so its partial
+    # count is never mistaken for a finished subtree.
+    if _SPLIT_RUN is not None and _SPLIT_RUN.value != run: return STOPPED, [], 0, 0
+    found = 0 if kind == 'count' else None
+    children, complete = split_frontier(SudokuBoard.from_string(puzzle, box), 1)
+    if complete: found = len(complete) if kind == 'count' else complete[0].to_string()
+    ctx = _SubtreeContext(budget, _SPLIT_RUN, run, _SPLIT_HUNGRY, deadline)
+    nodes = back = 0
+    for k, child in enumerate(children):
+        if (found >= limit) if kind == 'count' else found: break
+        ctx.base = nodes; ctx.nodes = 0
+        try:
+            if kind == 'count':
+                solver = ENGINES[engine]()
+                found += solver.count_solutions(child, limit - found, ctx=ctx)
+                nodes += getattr(solver, 'nodes', 0); back += getattr(solver, 'backtracks', 0)
+            else:
+                solved, _, n, b = solve_board(child, engine, ctx)
+                nodes += n; back += b
+                if solved: found = solved.to_string()
+        except _OverBudget:
+            return found, [c.to_string() for c in children[k:]], nodes + ctx.nodes, back
+        except SolverTimeout:
+            raise
+        except SolverCancelled:
+            return STOPPED, [], nodes + ctx.nodes, back
+    return found, [], nodes, back
+
+class ParallelSearch:
+    # Runs one board's search on a process pool. The tree is expanded to `depth` levels (and
+    # to at least `oversplit` tasks per worker) and each open subtree becomes a pool task.
+    # A task searches its subtree one child at a time. When it has run past `budget` nodes
+    # while a worker sits idle, it returns what it found so far and its unfinished children,
+    # which go back on the shared queue with twice the budget, so the idle worker picks up
+    # part of the heavy branch instead of waiting on it. That is the work stealing, done through the
+    # executor's queue: a process pool has no shared deques to steal from.
+    # count_solutions() sums the subtree counts and stops at `limit`; solve() returns the
+    # first solution found. Either way the remaining tasks are cancelled and the running
+    # ones stop: every run gets a new id in a shared counter, and a task whose id is no
+    # longer current gives up. Runs on one instance are serialised (a second caller waits
+    # for the first to finish or be cancelled). The pool is created on first use; close()
+    # ends it.
+    # engine: 'dlx' or 'backtracking' for counting, any registered engine for solve().
+    def __init__(self, workers=None, depth=2, budget=20000, engine='dlx', oversplit=4):
+        self.workers = workers or os.cpu_count() or 1
+        self.depth = depth
+        self.budget = budget
+        self.engine = engine
+        self.oversplit = oversplit
+        self.pool = None
+        self._lock = threading.Lock()
+        self.nodes = 0; self.backtracks = 0; self.tasks = 0; self.splits = 0
+
+    def _ensure_pool(self):
+        if self.pool is None:
+            from concurrent.futures import ProcessPoolExecutor
+            import multiprocessing as mp
+            mpc = mp.get_context("spawn")    # as for PuzzlePool: the app process runs Tk and threads
+            self._current = mpc.Value('q', 0); self._hungry = mpc.Event()
+            self.pool = ProcessPoolExecutor(self.workers, mp_context=mpc, initializer=_init_split_worker,
+                                            initargs=(self._current, self._hungry))
+        self._hungry.clear()
+
+    def _next_run(self):
+        # a fresh run id; tasks of every earlier run see that theirs is stale and stop
+        with self._current.get_lock():
+            self._current.value += 1
+            return self._current.value
+
+    def close(self):
+        if self.pool is not None:
+            self._next_run()
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+
+    def count_solutions(self, board: SudokuBoard, limit=None, ctx=None):
+        # number of solutions, or `limit` once that many are found (None: count them all)
+        return self._run('count', board, limit, ctx)[0]
+
+    def solve(self, board: SudokuBoard, ctx=None):
+        start = time.perf_counter()
+        _, solved = self._run('solve', board, 1, ctx)
+        return solved, time.perf_counter() - start, self.nodes, self.backtracks
+
+    def _run(self, kind, board, limit, ctx):
+        with self._lock:
+            return self._run_locked(kind, board, limit, ctx)
+
+    def _run_locked(self, kind, board, limit, ctx):
+        from concurrent.futures import wait, FIRST_COMPLETED
+        self.nodes = 0; self.backtracks = 0; self.tasks = 0; self.splits = 0
+        limit = limit or float('inf')
+        frontier, complete = split_frontier(board, self.depth, self.oversplit * self.workers)
+        total = len(complete)
+        first = complete[0] if complete else None
+        if total >= limit or (kind == 'solve' and first) or not frontier:
+            return min(total, limit) if kind == 'count' else total, first
+        if ctx and ctx.cancelled: raise SolverCancelled("cancelled")
+        self._ensure_pool()
+        run = self._next_run()
+        box = board.g.box; deadline = ctx.deadline if ctx else None
+        pending = {}
+        def submit(puzzle, budget):
+            left = limit - total if kind == 'count' else 1
+            fut = self.pool.submit(_subtree_task, kind, self.engine, puzzle, box, left, budget, deadline, run)
+            pending[fut] = budget; self.tasks += 1
+        for b in frontier: submit(b.to_string(), self.budget)
+        try:
+            while pending and total < limit:
+                done, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                if ctx:
+                    if ctx.cancelled: raise SolverCancelled("cancelled")
+                    if ctx.deadline is not None and time.time() >= ctx.deadline:
+                        raise SolverTimeout("deadline exceeded")
+                for fut in done:
+                    budget = pending.pop(fut)
+                    found, rest, nodes, back = fut.result()
+                    self.nodes += nodes; self.backtracks += back
+                    if found == STOPPED:
+                        # only tasks of a run that has ended stop; never merge a partial count
+                        raise SolverCancelled("search stopped")
+                    if kind == 'count':
+                        total += found
+                    elif found:
+                        first = SudokuBoard.from_string(found, box); total = 1
+                    if rest and total < limit:
+                        self.splits += 1
+                        for p in rest: submit(p, 2*budget)
+                # tasks over budget only split while fewer tasks are left than workers to run them
+                if len(pending) < self.workers: self._hungry.set()
+                else: self._hungry.clear()
+        finally:
+            if pending:
+                self._next_run()
+                for fut in pending: fut.cancel()
+                wait(pending)
+        return min(total, limit) if kind == 'count' else total, first
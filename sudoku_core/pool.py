@@ -0,0 +1,91 @@
+"""Pre-generated puzzle pool filled by background worker processes."""
+
+import os, threading
+from collections import deque
+
+from .board import SudokuBoard
+from .generator import Generator
+
+# -----------------------------
+# Pre-generated puzzle pool
+# -----------------------------
+DIFFICULTIES = ("Easy", "Medium", "Hard")
+
+def _generate_puzzle(difficulty):
+    # runs in a pool worker process
+    return Generator().make_puzzle(difficulty).to_string()
+
+class PuzzlePool:
+    # Keeps `depth` ready puzzles per difficulty. Background worker processes top it up and
+    # it is saved to `path` (one "<difficulty> <81 digits>" line per puzzle), so a restart starts warm.
+    def __init__(self, path=None, depth=5, workers=1):
+        self.path = path
+        self.depth = depth
+        self.workers = workers
+        self.pools = {d: deque() for d in DIFFICULTIES}
+        self.pending = {d: 0 for d in DIFFICULTIES}
+        self.lock = threading.Lock()
+        self.save_lock = threading.Lock()
+        self.executor = None
+        self.load()
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path): return
+        with open(self.path) as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 2 and parts[0] in self.pools and len(parts[1]) == 81 and parts[1].isdigit():
+                    self.pools[parts[0]].append(parts[1])
+
+    def save(self):
+        # called from the Tk thread (pop) and from executor callbacks (_done); save_lock keeps
+        # one writer on the temp file at a time. A failed save only loses the warm start, so
+        # it never propagates into pop().
+        if not self.path: return
+        with self.save_lock:
+            with self.lock:
+                lines = [f"{d} {p}\n" for d in DIFFICULTIES for p in self.pools[d]]
+            tmp = self.path + ".tmp"
+            try:
+                with open(tmp, "w") as f: f.writelines(lines)
+                os.replace(tmp, self.path)
+            except OSError:
+                pass
+
+    def size(self, difficulty):
+        return len(self.pools[difficulty])
+
+    def pop(self, difficulty):
+        # a ready puzzle, or None if the pool for this difficulty is empty; always triggers a refill
+        with self.lock:
+            p = self.pools[difficulty].popleft() if self.pools[difficulty] else None
+        self.refill()
+        if p is None: return None
+        self.save()
+        return SudokuBoard.from_string(p)
+
+    def refill(self):
+        if self.executor is None:
+            from concurrent.futures import ProcessPoolExecutor
+            import multiprocessing as mp
+            # spawn: forking a process that already runs Tk and worker threads is not safe
+            self.executor = ProcessPoolExecutor(self.workers, mp_context=mp.get_context("spawn"))
+        with self.lock:
+            for d in DIFFICULTIES:
+                for _ in range(self.depth - len(self.pools[d]) - self.pending[d]):
+                    self.pending[d] += 1
+                    fut = self.executor.submit(_generate_puzzle, d)
+                    fut.add_done_callback(lambda f, d=d: self._done(d, f))
+
+    def _done(self, difficulty, fut):
+        with self.lock:
+            self.pending[difficulty] -= 1
+            if fut.cancelled() or fut.exception(): return
+            self.pools[difficulty].append(fut.result())
+        self.save()
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+        self.save()
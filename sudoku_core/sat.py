@@ -0,0 +1,231 @@
+"""CNF encoding and the CDCL SAT solver."""
+
+import time, itertools, heapq
+
+from .board import SudokuBoard
+
+# -----------------------------
+# SAT encoding + CDCL solver
+# -----------------------------
+def sudoku_cnf(board: SudokuBoard):
+    # CNF for `board`: variable cell*n + d (1-based; 729 of them on 9x9) means "cell holds d".
+    # Exactly one digit per cell and each digit exactly once per row, column and box, with
+    # the givens as unit clauses. Returns (number of variables, list of clauses).
+    g = board.g; n = g.n
+    clauses = []
+    def exactly_one(lits):
+        clauses.append(lits)
+        clauses.extend([-a, -b] for a, b in itertools.combinations(lits, 2))
+    for i in range(g.ncells): exactly_one([i*n + d for d in range(1, n+1)])
+    for unit in g.unit_list:
+        for d in range(1, n+1): exactly_one([i*n + d for i in unit])
+    clauses.extend([i*n + v] for i, v in enumerate(board.cells) if v)
+    return g.ncells*n, clauses
+
+def to_dimacs(nvars, clauses, comment=None):
+    lines = [f"c {comment}"] if comment else []
+    lines.append(f"p cnf {nvars} {len(clauses)}")
+    lines.extend(' '.join(map(str, c)) + ' 0' for c in clauses)
+    return '\n'.join(lines) + '\n'
+
+def _luby(i):
+    # i-th term (from 1) of the Luby restart sequence 1 1 2 1 1 2 4 1 1 2 ...
+    k = 1
+    while (1 << k) - 1 < i: k += 1
+    while (1 << k) - 1 != i:
+        i -= (1 << (k-1)) - 1
+        k = 1
+        while (1 << k) - 1 < i: k += 1
+    return 1 << (k-1)
+
+class CDCL:
+    # Conflict-driven clause learning over DIMACS-style clauses (lists of non-zero ints):
+    # two watched literals per clause, first-UIP learning with backjumping, VSIDS branching
+    # with phase saving and Luby restarts. Internally variable x is literal 2x and -x is
+    # 2x+1, so negation is ^1; val[] holds 1 / -1 / 0 per literal.
+    def __init__(self, nvars, clauses, restart_base=100, decay=0.95):
+        self.nvars = nvars
+        self.val = [0]*(2*nvars+2)
+        self.level = [0]*(nvars+1); self.reason = [None]*(nvars+1)
+        self.watches = [[] for _ in range(2*nvars+2)]     # literal -> clauses watching it
+        self.trail = []; self.trail_lim = []; self.qhead = 0
+        self.activity = [0.0]*(nvars+1); self.inc = 1.0; self.decay = decay
+        self.phase = [1]*(nvars+1)                         # saved polarity, 1 = negative
+        self.heap = [(0.0, v) for v in range(1, nvars+1)]  # (-activity, var), may hold stale entries
+        self.seen = bytearray(nvars+1)
+        self.restart_base = restart_base
+        self.decisions = self.conflicts = self.propagations = self.learned = self.restarts = 0
+        self.ok = True
+        for c in clauses: self.add_clause(c)
+
+    def add_clause(self, lits):
+        # only before solve(); clauses already satisfied or tautological are dropped
+        c = []
+        for x in lits:
+            L = 2*x if x > 0 else -2*x + 1
+            if L ^ 1 in c: return
+            if L not in c: c.append(L)
+        if any(self.val[L] == 1 for L in c): return
+        c = [L for L in c if self.val[L] == 0]
+        if not c: self.ok = False
+        elif len(c) == 1: self._assign(c[0], None)
+        else:
+            self.watches[c[0]].append(c); self.watches[c[1]].append(c)
+
+    def _assign(self, L, reason):
+        v = L >> 1
+        self.val[L] = 1; self.val[L ^ 1] = -1
+        self.level[v] = len(self.trail_lim); self.reason[v] = reason
+        self.trail.append(L)
+
+    def propagate(self):
+        # unit propagation over the trail; returns a conflicting clause or None.
+        # A clause's implied literal is always its c[0].
+        val = self.val; watches = self.watches; trail = self.trail
+        while self.qhead < len(trail):
+            false_lit = trail[self.qhead] ^ 1; self.qhead += 1
+            self.propagations += 1
+            ws = watches[false_lit]
+            i = j = 0; n = len(ws)
+            while i < n:
+                c = ws[i]; i += 1
+                if c[0] == false_lit: c[0] = c[1]; c[1] = false_lit
+                first = c[0]
+                if val[first] == 1:
+                    ws[j] = c; j += 1; continue
+                for k in range(2, len(c)):
+                    L = c[k]
+                    if val[L] != -1:
+                        c[1] = L; c[k] = false_lit
+                        watches[L].append(c)
+                        break
+                else:
+                    ws[j] = c; j += 1
+                    if val[first] == -1:
+                        while i < n: ws[j] = ws[i]; j += 1; i += 1
+                        del ws[j:]
+                        self.qhead = len(trail)
+                        return c
+                    self._assign(first, c)
+            del ws[j:]
+        return None
+
+    def analyze(self, confl):
+        # first-UIP learnt clause (asserting literal first) and the level to jump back to
+        seen = self.seen; level = self.level; trail = self.trail
+        cur = len(self.trail_lim)
+        learnt = [0]; counter = 0; p = None; idx = len(trail) - 1
+        while True:
+            for q in (confl if p is None else confl[1:]):
+                v = q >> 1
+                if not seen[v] and level[v] > 0:
+                    seen[v] = 1; self._bump(v)
+                    if level[v] >= cur: counter += 1
+                    else: learnt.append(q)
+            while not seen[trail[idx] >> 1]: idx -= 1
+            p = trail[idx]; idx -= 1
+            v = p >> 1; seen[v] = 0; counter -= 1
+            if counter == 0: break
+            confl = self.reason[v]
+        learnt[0] = p ^ 1
+        for q in learnt[1:]: seen[q >> 1] = 0
+        if len(learnt) == 1: return learnt, 0
+        # the highest remaining level becomes the second watch and the backjump target
+        k = max(range(1, len(learnt)), key=lambda k: level[learnt[k] >> 1])
+        learnt[1], learnt[k] = learnt[k], learnt[1]
+        return learnt, level[learnt[1] >> 1]
+
+    def _bump(self, v):
+        a = self.activity
+        a[v] += self.inc
+        if a[v] > 1e100:
+            for u in range(1, self.nvars+1): a[u] *= 1e-100
+            self.inc *= 1e-100
+            self._rebuild_heap()
+
+    def _rebuild_heap(self):
+        self.heap = [(-self.activity[v], v) for v in range(1, self.nvars+1) if not self.val[2*v]]
+        heapq.heapify(self.heap)
+
+    def cancel_until(self, lvl):
+        if len(self.trail_lim) <= lvl: return
+        start = self.trail_lim[lvl]
+        val = self.val; heap = self.heap; act = self.activity
+        for L in self.trail[start:]:
+            v = L >> 1
+            val[L] = val[L ^ 1] = 0; self.reason[v] = None
+            self.phase[v] = L & 1
+            heapq.heappush(heap, (-act[v], v))
+        del self.trail[start:]; del self.trail_lim[lvl:]
+        self.qhead = start
+        if len(heap) > 4*self.nvars: self._rebuild_heap()
+
+    def _pick(self):
+        heap = self.heap; val = self.val
+        while heap:
+            v = heapq.heappop(heap)[1]
+            if not val[2*v]: return 2*v + self.phase[v]
+        return None
+
+    def solve(self, ctx=None):
+        # True if satisfiable (see model()), False if not
+        if not self.ok: return False
+        luby_i = 1; budget = self.restart_base; since = 0
+        while True:
+            confl = self.propagate()
+            if confl is not None:
+                self.conflicts += 1; since += 1
+                if not self.trail_lim: return False
+                learnt, lvl = self.analyze(confl)
+                self.cancel_until(lvl)
+                if len(learnt) == 1:
+                    self._assign(learnt[0], None)
+                else:
+                    self.watches[learnt[0]].append(learnt); self.watches[learnt[1]].append(learnt)
+                    self.learned += 1
+                    self._assign(learnt[0], learnt)
+                self.inc /= self.decay
+                continue
+            if since >= budget:
+                self.restarts += 1; since = 0
+                luby_i += 1; budget = self.restart_base * _luby(luby_i)
+                self.cancel_until(0)
+                continue
+            L = self._pick()
+            if L is None: return True
+            self.decisions += 1
+            if ctx: ctx.check(self.decisions, len(self.trail_lim))
+            self.trail_lim.append(len(self.trail))
+            self._assign(L, None)
+
+    def model(self):
+        # the variables set true
+        return [v for v in range(1, self.nvars+1) if self.val[2*v] == 1]
+
+class SATSolver:
+    # Engine wrapper: encodes the board with sudoku_cnf() and runs CDCL on it. nodes are
+    # decisions and backtracks are conflicts; the other CDCL counters land in self.stats.
+    def __init__(self):
+        self.nodes = 0
+        self.backtracks = 0
+        self.stats = {}
+
+    def solve(self, board: SudokuBoard, ctx=None):
+        start = time.perf_counter()
+        sat = CDCL(*sudoku_cnf(board))
+        ok = sat.solve(ctx)
+        self.nodes, self.backtracks = sat.decisions, sat.conflicts
+        self.stats = {"decisions": sat.decisions, "conflicts": sat.conflicts, "propagations": sat.propagations,
+                      "learned": sat.learned, "restarts": sat.restarts}
+        out = None
+        if ok:
+            n = board.n; cells = [0]*board.g.ncells
+            for v in sat.model():
+                i, d = divmod(v-1, n); cells[i] = d+1
+            out = SudokuBoard([cells[r*n:r*n+n] for r in range(n)])
+        return out, time.perf_counter() - start, self.nodes, self.backtracks
+
+    def export_dimacs(self, board: SudokuBoard, path):
+        nvars, clauses = sudoku_cnf(board)
+        with open(path, "w") as f:
+            f.write(to_dimacs(nvars, clauses, f"sudoku {board.to_string()}; variable cell*{board.n}+digit"))
@@ -0,0 +1,122 @@
+"""Bounded transposition table of search results, keyed by Zobrist hashes."""
+
+import random
+from array import array
+
+# -----------------------------
+# Zobrist keys
+# -----------------------------
+# A search state is keyed by which cells are still open and which digits every row, column
+# and box already holds. Whether (and in how many ways) the open cells can be completed
+# depends on nothing else, so the key means the same thing to every engine and every puzzle
+# of one size, and two different fillings that leave the same unit masks (the two ways of
+# filling a "deadly rectangle") share an entry.
+# key = empty_key ^ XOR of fill[i*(n+1)+d] over the filled cells i, d their digits; fill
+# combines the cell's own key with its row, column and box keys for d, so filling or
+# clearing a cell is one XOR.
+_ZOBRIST = {}
+
+def zobrist(g):
+    # (empty_key, fill) for geometry g; the same seed gives the same keys in every process
+    z = _ZOBRIST.get(g.box)
+    if z is None:
+        rng = random.Random(0x5D0C0 + g.box)
+        n = g.n
+        unit = [[rng.getrandbits(64) for _ in range(n+1)] for _ in range(3*n)]
+        cell = [rng.getrandbits(64) for _ in range(g.ncells)]
+        empty_key = 0
+        for k in cell: empty_key ^= k
+        fill = [0] * (g.ncells*(n+1))
+        for i in range(g.ncells):
+            r, c, b = g.units[i]
+            for d in range(1, n+1):
+                fill[i*(n+1)+d] = cell[i] ^ unit[r][d] ^ unit[c][d] ^ unit[b][d]
+        z = _ZOBRIST[g.box] = (empty_key, fill)
+    return z
+
+def board_key(board):
+    empty_key, fill = zobrist(board.g)
+    s = board.n + 1; key = empty_key
+    for i, v in enumerate(board.cells):
+        if v: key ^= fill[i*s + v]
+    return key
+
+# -----------------------------
+# Transposition table
+# -----------------------------
+class TranspositionTable:
+    # Maps a state key to the number of completions of that state, with 0 recording a
+    # proven dead end (a nogood). Searches only store counts they proved exactly, so one
+    # table can be shared by engines, by successive solves and across puzzles of one size.
+    # Entries live in fixed arrays of 20 bytes per slot (key, count, work) sized to fit
+    # max_bytes, so the table never grows. work is the number of nodes the result cost and
+    # decides what a full slot keeps:
+    #   'depth'     keep the entry that took more work
+    #   'always'    the newest entry wins
+    #   'two-tier'  slots come in pairs: the first keeps the costlier entry, the second
+    #               takes whatever was not kept there
+    POLICIES = ('depth', 'always', 'two-tier')
+    SLOT_BYTES = 20
+
+    def __init__(self, max_bytes=8 << 20, policy='two-tier'):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown replacement policy {policy!r}; choose from {', '.join(self.POLICIES)}")
+        slots = 2
+        while slots * 2 * self.SLOT_BYTES <= max_bytes: slots *= 2
+        self.policy = policy
+        self.slots = slots
+        self.mask = slots - 1 if policy != 'two-tier' else slots - 2
+        self.keys = array('Q', bytes(8*slots))             # 0 marks an empty slot
+        self.counts = array('q', bytes(8*slots))
+        self.work = array('I', [0]) * slots
+        self.probes = self.hits = self.stores = self.replaced = self.rejected = 0
+
+    def probe(self, key):
+        # the stored count for key, or None
+        self.probes += 1
+        key = key or 1
+        k = key & self.mask
+        keys = self.keys
+        if keys[k] != key:
+            if self.policy != 'two-tier' or keys[k+1] != key: return None
+            k += 1
+        self.hits += 1
+        return self.counts[k]
+
+    def store(self, key, count, work=1):
+        if count >= 1 << 63: return
+        key = key or 1
+        work = min(work, 0xFFFFFFFF)
+        k = key & self.mask
+        keys, counts, works = self.keys, self.counts, self.work
+        if keys[k] and keys[k] != key:
+            if self.policy == 'two-tier':
+                if keys[k+1] and keys[k+1] != key: self.replaced += 1
+                if keys[k+1] == key or work < works[k]:
+                    k += 1
+                else:
+                    # the costlier entry takes the first slot; the one it displaces drops down
+                    keys[k+1], counts[k+1], works[k+1] = keys[k], counts[k], works[k]
+            elif self.policy == 'depth' and work < works[k]:
+                self.rejected += 1; return
+            else:
+                self.replaced += 1
+        keys[k] = key; counts[k] = count; works[k] = work
+        self.stores += 1
+
+    @property
+    def hit_rate(self):
+        return self.hits / self.probes if self.probes else 0.0
+
+    def used(self):
+        return sum(1 for k in self.keys if k)
+
+    def stats(self):
+        return {"probes": self.probes, "hits": self.hits, "hit_rate": round(self.hit_rate, 4),
+                "stores": self.stores, "replaced": self.replaced, "rejected": self.rejected,
+                "slots": self.slots, "used": self.used(), "bytes": self.slots * self.SLOT_BYTES}
+
+    def clear(self):
+        for a in (self.keys, self.counts, self.work):
+            a[:] = array(a.typecode, [0]) * self.slots
+        self.probes = self.hits = self.stores = self.replaced = self.rejected = 0
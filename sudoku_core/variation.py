@@ -0,0 +1,55 @@
+"""Streaming summary of how the solutions of a board differ."""
+
+from .board import SudokuBoard
+from .engines import iter_solutions
+
+# -----------------------------
+# Variation summary
+# -----------------------------
+class VariationSummary:
+    # Folds in solutions one at a time and keeps, per cell, the mask of digits seen so far,
+    # so repeats cost nothing and memory does not grow with the number of solutions. A cell
+    # varies once two different digits have been seen in it. `complete` is True only when
+    # consume() ran its stream to the end; after an early stop the summary describes a sample
+    # and a cell shown as fixed may still vary in solutions not seen.
+    def __init__(self, board: SudokuBoard):
+        self.g = board.g
+        self.seen = [0] * self.g.ncells
+        self.count = 0
+        self.complete = False
+
+    def add(self, solution: SudokuBoard):
+        seen = self.seen; bit = self.g.bit
+        for i, v in enumerate(solution.cells): seen[i] |= bit[v]
+        self.count += 1
+
+    def consume(self, solutions, limit=None):
+        # adds solutions from an iterator until it runs out or `limit` were added; a
+        # generator stopped early is closed, which ends its search
+        for sol in solutions:
+            self.add(sol)
+            if limit and self.count >= limit:
+                if hasattr(solutions, "close"): solutions.close()
+                return self
+        self.complete = True
+        return self
+
+    def varying(self):
+        # cell indices that took more than one digit
+        return [i for i, m in enumerate(self.seen) if m & (m-1)]
+
+    def fixed(self):
+        # {cell index: digit} for the cells that took one digit in every solution seen
+        return {i: m.bit_length() for i, m in enumerate(self.seen) if m and not m & (m-1)}
+
+    def digits(self, i):
+        return self.g.mask_digits[self.seen[i]]
+
+    def as_dict(self):
+        n = self.g.n
+        return {"solutions": self.count, "complete": self.complete,
+                "varying": {f"r{i//n+1}c{i%n+1}": list(self.digits(i)) for i in self.varying()}}
+
+def summarize(board: SudokuBoard, engine='dlx', limit=None, ctx=None):
+    # VariationSummary over the solutions of board (the first `limit` of them, if given)
+    return VariationSummary(board).consume(iter_solutions(board, engine, ctx), limit)